@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Compares DateParser with the email.utils dates it replaced
+
+    python -m benchmarks.dates [count]
+
+Times parsing the pubDate of count items, once with every date distinct
+and once with the repeated dates real feeds have.
+"""
+from datetime import datetime
+import email.utils
+import sys
+import timeit
+
+from pyPodcastParser.DateParser import DateParser
+
+
+def email_utils_dates(date_string):
+    """The previous Item path: two parses of the same string"""
+    time_tuple = email.utils.parsedate_tz(date_string)
+    time_published = email.utils.mktime_tz(time_tuple)
+    time_tuple = email.utils.parsedate(date_string)
+    return time_published, datetime(time_tuple[0], time_tuple[1],
+                                    time_tuple[2])
+
+
+def make_dates(count, distinct):
+    """Returns count pubDate strings with at most distinct different ones"""
+    return ["Mon, %02d Mar 2008 %02d:%02d:07 +0000" % (
+        index % 28 + 1, index // 60 % 24, index % 60)
+        for index in [position % distinct for position in range(count)]]
+
+
+def parse_cached(dates):
+    """Parses dates with a fresh DateParser, so only repeats are cached"""
+    parse = DateParser().parse
+    return [parse(date) for date in dates]
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[0]) if argv else 10000
+    for label, distinct in (('distinct', count), ('repeated', 50)):
+        dates = make_dates(count, distinct)
+        old = min(timeit.repeat(
+            lambda: [email_utils_dates(date) for date in dates],
+            number=1, repeat=3))
+        uncached = min(timeit.repeat(
+            lambda: [DateParser().parse_uncached(date) for date in dates],
+            number=1, repeat=3))
+        cached = min(timeit.repeat(
+            lambda: parse_cached(dates), number=1, repeat=3))
+        print("%-8s %6d dates  email.utils %.4fs  DateParser %.4fs "
+              "(%.1fx)  cached %.4fs (%.1fx)" % (
+                  label, count, old, uncached, old / uncached, cached,
+                  old / cached))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""Synthetic feeds for the benchmarks"""
+
+UNICODE_TEXT = u"ℐℑℒℓ℔✕✖✗✘⨒⨓ㄏㄐ㐆㐇㐈㐉蘿螺ﻛﻜﻝﻞ𝀏𝀐𝀑𝀒𝀓ǫǬǭǮǯǰΑΒΓΔΕΖΗΘɥɦɧखगڙښڛ"
+
+CHANNEL = u"""<?xml version="1.0" encoding="UTF-8"?>
+<rss xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd" version="2.0">
+    <channel>
+        <title>Synthetic podcast</title>
+        <link>https://example.com/</link>
+        <description>A synthetic podcast with {count} items</description>
+        <language>en-us</language>
+        <copyright>{unicode}</copyright>
+        <pubDate>Mon, 24 Mar 2008 23:30:07 GMT</pubDate>
+        <lastBuildDate>Mon, 24 Mar 2008 23:30:07 GMT</lastBuildDate>
+        <image>
+            <title>Synthetic image</title>
+            <url>https://example.com/image.jpg</url>
+            <link>https://example.com/</link>
+        </image>
+        <itunes:author>Synthetic author</itunes:author>
+        <itunes:category text="Technology"/>
+        <itunes:explicit>clean</itunes:explicit>
+        <itunes:image href="https://example.com/itunes.jpg"/>
+        <itunes:keywords>synthetic, benchmark</itunes:keywords>
+        <itunes:owner>
+            <itunes:name>Synthetic owner</itunes:name>
+            <itunes:email>owner@example.com</itunes:email>
+        </itunes:owner>
+{items}
+    </channel>
+</rss>
+"""
+
+ITEM = u"""        <item>
+            <title>Episode {number} {unicode}</title>
+            <link>https://example.com/episodes/{number}</link>
+            <guid isPermaLink="false">synthetic-{number}</guid>
+            <description><![CDATA[<p>Description of <b>episode {number}</b></p>]]></description>
+            <category>Benchmarks</category>
+            <pubDate>{published}</pubDate>
+            <enclosure url="https://example.com/{number}.mp3" length="{length}" type="audio/mpeg"/>
+            <itunes:author>Synthetic author</itunes:author>
+            <itunes:duration>1:05:{seconds:02d}</itunes:duration>
+            <itunes:explicit>no</itunes:explicit>
+            <itunes:image href="https://example.com/{number}.jpg"/>
+            <itunes:subtitle>Subtitle {number}</itunes:subtitle>
+            <itunes:summary>Summary of episode {number} {unicode}</itunes:summary>
+        </item>
+"""
+
+DAYS = (u"Mon", u"Tue", u"Wed", u"Thu", u"Fri", u"Sat", u"Sun")
+
+
+def make_item(number):
+    """Returns one item, newest items have the lowest numbers"""
+    day = 28 - number % 28
+    published = u"%s, %02d Feb 2016 %02d:%02d:00 +0000" % (
+        DAYS[day % 7], day, number % 24, number % 60)
+    return ITEM.format(number=number, unicode=UNICODE_TEXT,
+                       published=published, length=1000000 + number,
+                       seconds=number % 60)
+
+
+def make_feed(count):
+    """Returns a feed with count items"""
+    items = u"".join(make_item(number) for number in range(count))
+    return CHANNEL.format(count=count, unicode=UNICODE_TEXT, items=items)
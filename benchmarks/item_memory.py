@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""Measures the memory retained by each parsed Item
+
+    python -m benchmarks.item_memory [count]
+"""
+import gc
+import sys
+import tracemalloc
+
+from pyPodcastParser.Podcast import Podcast
+
+from benchmarks.feeds import make_feed
+
+
+def retained_items(feed, engine):
+    """Parses feed and returns its items with everything else released"""
+    items = list(Podcast(feed, engine=engine).items)
+    gc.collect()
+    return items
+
+
+def measure(count, engine):
+    """Returns the bytes retained per Item after the Podcast is released"""
+    feed = make_feed(count)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = retained_items(feed, engine)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / float(len(items)), sys.getsizeof(items[0])
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    for engine in Podcast.ENGINES:
+        per_item, shallow = measure(count, engine)
+        print("%-6s %8d items %10.0f bytes per item (Item object %d bytes)"
+              % (engine, count, per_item, shallow))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks Podcast, Item, to_dict and ItemColumns on synthetic feeds
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --sizes 10,1000 --compare results.json
+
+Each result records the best time of --repeat runs, the time per item and
+the peak memory allocated while parsing. Results are written as JSON so two
+versions can be compared with --compare.
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+import warnings
+
+from pyPodcastParser.Item import Item
+from pyPodcastParser.ItemColumns import ItemColumns
+from pyPodcastParser.Podcast import Podcast
+
+from benchmarks.feeds import make_feed
+
+SIZES = (10, 100, 1000, 10000, 50000)
+
+
+def best_time(function, repeat):
+    """Returns the fastest of repeat calls to function, in seconds"""
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def peak_memory(function):
+    """Returns the peak number of bytes allocated while calling function"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def item_soups(feed, engine):
+    """Returns the soup of every item, the way Podcast finds them"""
+    podcast = Podcast(feed, engine=engine, lazy_items=True)
+    return podcast.items.item_soups
+
+
+def run_size(count, engine, repeat):
+    """Runs every benchmark for a feed of count items"""
+    feed = make_feed(count)
+    podcast = Podcast(feed, engine=engine)
+    soups = item_soups(feed, engine)
+    benchmarks = (
+        ('podcast', lambda: Podcast(feed, engine=engine)),
+        ('item', lambda: [Item(soup) for soup in soups]),
+        ('to_dict', podcast.to_dict),
+        ('columns', lambda: ItemColumns.from_podcasts([podcast])),
+    )
+    results = []
+    for name, function in benchmarks:
+        seconds = best_time(function, repeat)
+        results.append({
+            'benchmark': name,
+            'engine': engine,
+            'items': count,
+            'feed_bytes': len(feed.encode('utf-8')),
+            'seconds': seconds,
+            'per_item_seconds': seconds / count,
+            'peak_bytes': peak_memory(function),
+        })
+    return results
+
+
+def compare(results, baseline):
+    """Prints the time and memory ratio of each result to its baseline"""
+    def key(result):
+        return result['benchmark'], result['engine'], result['items']
+    previous = dict((key(result), result) for result in baseline['results'])
+    print("%-8s %-6s %6s %10s %10s" % (
+        'bench', 'engine', 'items', 'time', 'memory'))
+    for result in results['results']:
+        old = previous.get(key(result))
+        if old is None:
+            continue
+        print("%-8s %-6s %6d %9.2fx %9.2fx" % (
+            result['benchmark'], result['engine'], result['items'],
+            result['seconds'] / old['seconds'],
+            result['peak_bytes'] / float(old['peak_bytes'])))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--sizes', default=','.join(map(str, SIZES)),
+                        help='comma separated item counts')
+    parser.add_argument('--engines', default=','.join(Podcast.ENGINES),
+                        help='comma separated engines')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--label', default='', help='stored with the results')
+    parser.add_argument('--output', help='write the results to this file')
+    parser.add_argument('--compare', help='results file to compare against')
+    args = parser.parse_args(argv)
+
+    warnings.simplefilter('ignore')
+    results = {
+        'label': args.label,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': [],
+    }
+    for count in [int(size) for size in args.sizes.split(',')]:
+        for engine in args.engines.split(','):
+            for result in run_size(count, engine, args.repeat):
+                results['results'].append(result)
+                sys.stderr.write(
+                    "%(benchmark)-8s %(engine)-6s %(items)6d items "
+                    "%(seconds)9.4fs %(per_item_seconds)9.6fs/item "
+                    "%(peak_bytes)11d bytes peak\n" % result)
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2, sort_keys=True)
+    else:
+        json.dump(results, sys.stdout, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as baseline:
+            compare(results, json.load(baseline))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+from collections import namedtuple
+
+from pyPodcastParser.Item import Item
+
+
+class ItemChange(namedtuple('ItemChange', ['old', 'new', 'fields'])):
+    """An item present in both parses with different fields
+
+    Attributes:
+        old (Item): The item in the old parse
+        new (Item): The item in the new parse
+        fields (list): Names of the fields that differ
+    """
+    __slots__ = ()
+
+
+def field_values(obj, fields):
+    """Returns the fields of an Item or Podcast as a hashable tuple"""
+    values = []
+    for field in fields:
+        value = getattr(obj, field)
+        if isinstance(value, list):
+            value = tuple(value)
+        values.append(value)
+    return tuple(values)
+
+
+def item_key(item):
+    """Identifies an item by guid, or by enclosure url without a guid"""
+    guid = getattr(item, 'guid', None)
+    if guid is not None:
+        return 'guid', guid
+    enclosure_url = getattr(item, 'enclosure_url', None)
+    if enclosure_url is not None:
+        return 'enclosure_url', enclosure_url
+    return None
+
+
+class ItemRecord(object):
+    """An item with its field values and their hash, computed once"""
+
+    __slots__ = ('item', 'values', 'hash')
+
+    def __init__(self, item, fields):
+        self.item = item
+        self.values = field_values(item, fields)
+        self.hash = hash(self.values)
+
+
+class Changeset(object):
+    """The item and channel changes between two parses of a feed
+
+    Items are matched by guid, falling back to enclosure url. Items with
+    neither are matched by content, so they are only ever added or removed.
+    Every item is hashed once and matched through a dict, so building a
+    Changeset is linear in the number of items. Only the fields parsed in
+    both podcasts are compared.
+
+    Args:
+        old (Podcast): The earlier parse
+        new (Podcast): The later parse
+
+    Attributes:
+        added (list): Items only in new, in new's order
+        removed (list): Items only in old, in old's order
+        modified (list): ItemChange of each matched item that differs
+        unchanged (int): Number of matched items that are equal
+        channel_fields (list): Names of the channel fields that differ
+    """
+
+    def __init__(self, old, new):
+        channel_fields = self.get_fields(old.fields, old.projection,
+                                         new.projection)
+        item_fields = self.get_fields(Item.fields, old.item_projection,
+                                      new.item_projection)
+        self.channel_fields = self.diff_fields(
+            field_values(old, channel_fields),
+            field_values(new, channel_fields), channel_fields)
+        self.added = []
+        self.removed = []
+        self.modified = []
+        self.unchanged = 0
+
+        old_records = {}
+        for key, record in self.index(old.items, item_fields):
+            old_records[key] = record
+        for key, record in self.index(new.items, item_fields):
+            old_record = old_records.pop(key, None)
+            if old_record is None:
+                self.added.append(record.item)
+            elif (old_record.hash == record.hash and
+                  old_record.values == record.values):
+                self.unchanged += 1
+            else:
+                self.modified.append(ItemChange(
+                    old_record.item, record.item,
+                    self.diff_fields(old_record.values, record.values,
+                                     item_fields)))
+        self.removed = [record.item for record in old_records.values()]
+
+    @staticmethod
+    def get_fields(fields, old_projection, new_projection):
+        """Returns the fields parsed in both podcasts, in schema order"""
+        return tuple(field for field in fields
+                     if (old_projection is None or field in old_projection) and
+                     (new_projection is None or field in new_projection))
+
+    @staticmethod
+    def index(items, fields):
+        """Yields each item's key and ItemRecord in feed order
+
+        A key repeated within one feed is numbered by occurrence, so
+        duplicates are matched in order instead of overwriting each other.
+        """
+        occurrences = {}
+        for item in items:
+            record = ItemRecord(item, fields)
+            key = item_key(item)
+            if key is None:
+                key = 'content', record.values
+            occurrence = occurrences.get(key, 0)
+            occurrences[key] = occurrence + 1
+            yield (key, occurrence), record
+
+    @staticmethod
+    def diff_fields(old_values, new_values, fields):
+        """Returns the names of the fields whose values differ"""
+        return [field for field, old_value, new_value
+                in zip(fields, old_values, new_values)
+                if old_value != new_value]
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.modified or
+                    self.channel_fields)
+
+    __nonzero__ = __bool__
+
+    def __repr__(self):
+        return '<Changeset added=%d removed=%d modified=%d unchanged=%d>' % (
+            len(self.added), len(self.removed), len(self.modified),
+            self.unchanged)
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+from calendar import timegm
+from datetime import datetime, timedelta, tzinfo
+import email.utils
+import re
+
+try:
+    from datetime import timezone
+except ImportError:
+    class timezone(tzinfo):
+        """A fixed offset from UTC, for Pythons without datetime.timezone"""
+
+        def __init__(self, offset):
+            self.offset = offset
+
+        def utcoffset(self, dt):
+            return self.offset
+
+        def dst(self, dt):
+            return timedelta(0)
+
+        def tzname(self, dt):
+            return None
+
+    timezone.utc = timezone(timedelta(0))
+
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+# Zones named in RFC 822. Unknown names are read as UTC, like email.utils.
+ZONES = {
+    'ut': 0, 'utc': 0, 'gmt': 0, 'z': 0,
+    'est': -5 * 3600, 'edt': -4 * 3600, 'cst': -6 * 3600, 'cdt': -5 * 3600,
+    'mst': -7 * 3600, 'mdt': -6 * 3600, 'pst': -8 * 3600, 'pdt': -7 * 3600,
+}
+RFC_822 = re.compile(r"""
+    \s*(?:[a-z]+\.?\s*,?\s*)?                       # day name
+    (\d{1,2})[\s-]+([a-z]{3})[a-z]*\.?[\s-]+(\d{2,4})  # day month year
+    (?:\s+(\d{1,2}):(\d{2})(?::(\d{2}))?(?:\.\d+)?)?   # time
+    \s*([a-z]+|[+-]\d{2}:?\d{2})?                   # zone
+    \s*(?:\(.*\))?\s*$                              # comment
+""", re.I | re.X)
+ISO_8601 = re.compile(r"""
+    \s*(\d{4})-(\d{2})-(\d{2})
+    (?:[t\s](\d{2}):(\d{2})(?::(\d{2})(?:\.\d+)?)?)?
+    \s*(z|[+-]\d{2}(?::?\d{2})?)?\s*$
+""", re.I | re.X)
+EPOCH = datetime(1970, 1, 1)
+EPOCH_ORDINAL = EPOCH.toordinal()
+UTC_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+NOT_A_DATE = (None, None, None)
+TIMEZONES = {0: timezone.utc}
+
+
+def get_timezone(offset):
+    """Returns a shared timezone for an offset in seconds"""
+    try:
+        return TIMEZONES[offset]
+    except KeyError:
+        return TIMEZONES.setdefault(offset,
+                                    timezone(timedelta(seconds=offset)))
+
+
+def aware_datetime(timestamp, offset):
+    """Returns the aware datetime of a timestamp in the date's timezone"""
+    return (UTC_EPOCH + timedelta(seconds=timestamp)).astimezone(
+        get_timezone(offset))
+
+
+def parse_offset(zone):
+    """Returns the offset of a zone name or +hhmm in seconds"""
+    if zone is None:
+        return 0
+    if zone[0] in '+-':
+        digits = zone[1:].replace(':', '')
+        offset = int(digits[:2]) * 3600 + int(digits[2:] or 0) * 60
+        if zone[0] == '-':
+            return -offset
+        return offset
+    return ZONES.get(zone.lower(), 0)
+
+
+def parse_year(year):
+    """Expands two digit years the way email.utils does"""
+    year = int(year)
+    if year < 100:
+        if year > 68:
+            return year + 1900
+        return year + 2000
+    return year
+
+
+def to_result(year, month, day, hour, minute, second, offset):
+    """Returns (time_published, date_time, published_datetime) from the
+    fields of a date
+
+    Out of range fields roll over, so 31 Feb is read as 2 or 3 Mar.
+    """
+    local = timegm((year, month, day, hour, minute, second, 0, 0, 0))
+    try:
+        date_time = EPOCH + timedelta(days=local // 86400)
+        return (local - offset, date_time,
+                aware_datetime(local - offset, offset))
+    except OverflowError:
+        return NOT_A_DATE
+
+
+def parse_common(date_string):
+    """Parses 'Mon, 24 Mar 2008 23:30:07 +0000' without a regex
+
+    Returns None for anything else, to be handled by parse_rfc_822.
+    """
+    parts = date_string.split()
+    if len(parts) != 6:
+        return None
+    _, day, month, year, clock, zone = parts
+    month = MONTHS.get(month.lower())
+    if month is None or len(year) != 4 or len(clock) != 8:
+        return None
+    if len(zone) == 5 and zone[0] in '+-':
+        offset = int(zone[1:3]) * 3600 + int(zone[3:]) * 60
+        if zone[0] == '-':
+            offset = -offset
+    else:
+        offset = ZONES.get(zone.lower())
+        if offset is None:
+            return None
+    date_time = datetime(int(year), month, int(day))
+    local = ((date_time.toordinal() - EPOCH_ORDINAL) * 86400 +
+             int(clock[:2]) * 3600 + int(clock[3:5]) * 60 + int(clock[6:]))
+    return local - offset, date_time, aware_datetime(local - offset, offset)
+
+
+def parse_rfc_822(date_string):
+    """Parses RFC 822 variants: no day name, full month names, two digit
+    years, no time, no seconds, +hh:mm offsets and trailing comments"""
+    match = RFC_822.match(date_string)
+    if match is None:
+        return None
+    day, month, year, hour, minute, second, zone = match.groups()
+    month = MONTHS.get(month.lower())
+    if month is None:
+        return None
+    return to_result(parse_year(year), month, int(day), int(hour or 0),
+                     int(minute or 0), int(second or 0), parse_offset(zone))
+
+
+def parse_iso_8601(date_string):
+    """Parses W3C dates like 2008-03-24T23:30:07Z, which some feeds use"""
+    match = ISO_8601.match(date_string)
+    if match is None:
+        return None
+    year, month, day, hour, minute, second, zone = match.groups()
+    if zone is not None and zone.lower() == 'z':
+        zone = None
+    return to_result(int(year), int(month), int(day), int(hour or 0),
+                     int(minute or 0), int(second or 0), parse_offset(zone))
+
+
+def parse_email(date_string):
+    """Falls back on email.utils for anything else it understands"""
+    time_tuple = email.utils.parsedate_tz(date_string)
+    if time_tuple is None:
+        return None
+    return to_result(time_tuple[0], time_tuple[1], time_tuple[2],
+                     time_tuple[3], time_tuple[4], time_tuple[5],
+                     time_tuple[9] or 0)
+
+
+class DateParser(object):
+    """Parses published dates once and remembers the results
+
+    Every date is parsed a single time into both time_published and
+    date_time. The common RFC 822 shape is split without a regex, the rest
+    go through progressively more tolerant parsers before giving up.
+
+    Feeds repeat the same timestamps, so results are kept in a dict that is
+    emptied once it holds max_entries strings.
+
+    Args:
+        max_entries (int): Most date strings remembered
+    """
+
+    parsers = (parse_common, parse_rfc_822, parse_iso_8601, parse_email)
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self.cache = {}
+
+    def parse(self, date_string):
+        """Returns (time_published, date_time, published_datetime) of a date
+
+        time_published is a unix timestamp, date_time the naive date and
+        published_datetime the aware datetime, both in the date's own
+        timezone. All are None when the string is not a date.
+        """
+        if date_string is None:
+            return NOT_A_DATE
+        try:
+            return self.cache[date_string]
+        except KeyError:
+            pass
+        result = self.parse_uncached(date_string)
+        if len(self.cache) >= self.max_entries:
+            self.cache.clear()
+        self.cache[date_string] = result
+        return result
+
+    def parse_uncached(self, date_string):
+        for parser in self.parsers:
+            try:
+                result = parser(date_string)
+            except (ValueError, OverflowError, TypeError, IndexError):
+                result = None
+            if result is not None:
+                return result
+        return NOT_A_DATE
+
+
+def parse_duration(duration):
+    """Returns an itunes:duration in whole seconds
+
+    Accepts HH:MM:SS, MM:SS and plain seconds, with or without fractions.
+    Returns None for anything else.
+    """
+    if duration is None:
+        return None
+    parts = duration.strip().split(':')
+    if len(parts) > 3 or parts[-1][:1] in ('-', '+'):
+        return None
+    seconds = 0
+    for part in parts[:-1]:
+        if not part.isdigit():
+            return None
+        seconds = seconds * 60 + int(part)
+    try:
+        seconds = seconds * 60 + float(parts[-1])
+    except ValueError:
+        return None
+    if seconds < 0 or seconds != seconds or seconds == float('inf'):
+        return None
+    return int(round(seconds))
+
+
+parse_date = DateParser().parse
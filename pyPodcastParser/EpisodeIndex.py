@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+from bisect import bisect_left, insort
+from collections import namedtuple
+
+
+class Episode(namedtuple('Episode', ['feed', 'item'])):
+    """An indexed Item and the key of the feed it came from
+
+    Attributes:
+        feed: The key the feed was added under
+        item (Item): The item
+    """
+    __slots__ = ()
+
+
+class EpisodeIndex(object):
+    """Finds the items of many feeds by guid, enclosure url or date
+
+    guids and enclosure urls are looked up in dicts. Items with a
+    time_published are also kept in a list sorted by it, so a date range is
+    two bisections. Feeds are added under a key, and adding a feed again
+    replaces its previous items, so the index follows feeds as they are
+    re-parsed. Each item of the feed is inserted into or deleted from the
+    sorted list at the position found by bisection.
+
+    Attributes:
+        feeds (dict): Feed key to the entry ids of its items
+    """
+
+    def __init__(self):
+        self.feeds = {}
+        self.entries = {}
+        self.by_guid = {}
+        self.by_enclosure_url = {}
+        self.by_time = []
+        self.next_id = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, feed):
+        return feed in self.feeds
+
+    def add(self, feed, podcast):
+        """Indexes the items of a Podcast, replacing the feed's old items
+
+        Args:
+            feed: Any hashable key for the feed, e.g. its url
+            podcast (Podcast): The parsed feed, or any iterable of Items
+        """
+        if feed in self.feeds:
+            self.remove(feed)
+        items = getattr(podcast, 'items', podcast)
+        entry_ids = []
+        by_time = self.by_time
+        for item in items:
+            entry_id = self.next_id
+            self.next_id += 1
+            entry_ids.append(entry_id)
+            self.entries[entry_id] = Episode(feed, item)
+            guid = getattr(item, 'guid', None)
+            if guid is not None:
+                self.by_guid.setdefault(guid, []).append(entry_id)
+            enclosure_url = getattr(item, 'enclosure_url', None)
+            if enclosure_url is not None:
+                self.by_enclosure_url.setdefault(
+                    enclosure_url, []).append(entry_id)
+            time_published = getattr(item, 'time_published', None)
+            if time_published is not None:
+                insort(by_time, (time_published, entry_id))
+        self.feeds[feed] = entry_ids
+
+    def remove(self, feed):
+        """Drops every item of a feed. Unknown feeds raise KeyError"""
+        entry_ids = self.feeds.pop(feed)
+        by_time = self.by_time
+        for entry_id in entry_ids:
+            item = self.entries.pop(entry_id).item
+            self.unlink(self.by_guid, getattr(item, 'guid', None), entry_id)
+            self.unlink(self.by_enclosure_url,
+                        getattr(item, 'enclosure_url', None), entry_id)
+            time_published = getattr(item, 'time_published', None)
+            if time_published is not None:
+                del by_time[bisect_left(by_time, (time_published, entry_id))]
+
+    @staticmethod
+    def unlink(index, value, entry_id):
+        if value is None:
+            return
+        entry_ids = index[value]
+        entry_ids.remove(entry_id)
+        if not entry_ids:
+            del index[value]
+
+    def find_guid(self, guid):
+        """Returns the Episodes with this guid, in the order they were added"""
+        return [self.entries[entry_id]
+                for entry_id in self.by_guid.get(guid, ())]
+
+    def find_enclosure_url(self, enclosure_url):
+        """Returns the Episodes with this enclosure url"""
+        return [self.entries[entry_id]
+                for entry_id in self.by_enclosure_url.get(enclosure_url, ())]
+
+    def between(self, start=None, end=None):
+        """Returns the Episodes published from start up to but not end
+
+        Args:
+            start (int): Unix timestamp, None for no lower bound
+            end (int): Unix timestamp, None for no upper bound
+
+        Returns:
+            list: Episodes sorted by time_published
+        """
+        by_time = self.by_time
+        if start is None:
+            low = 0
+        else:
+            low = bisect_left(by_time, (start,))
+        if end is None:
+            high = len(by_time)
+        else:
+            high = bisect_left(by_time, (end,))
+        return [self.entries[entry_id] for _, entry_id in by_time[low:high]]
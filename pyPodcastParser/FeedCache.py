@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+from collections import OrderedDict
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+
+import pyPodcastParser
+from pyPodcastParser.Podcast import Podcast
+
+
+def content_hash(feed_content, options):
+    """Returns a hex digest of the feed, the options and the parser version"""
+    if not isinstance(feed_content, bytes):
+        feed_content = feed_content.encode('utf-8')
+    try:
+        digest = hashlib.blake2b(digest_size=20)
+    except AttributeError:
+        digest = hashlib.sha1()
+    digest.update(pyPodcastParser.__version__.encode('ascii'))
+    options = [(key, sorted(value) if isinstance(value, (set, frozenset))
+                else value) for key, value in sorted(options.items())]
+    digest.update(repr(options).encode('utf-8'))
+    digest.update(feed_content)
+    return digest.hexdigest()
+
+
+class FeedCache(object):
+    """Returns the previous Podcast when the same feed is parsed again
+
+    Feeds are keyed on a hash of their content, the Podcast options and the
+    parser version. Podcasts are parsed with Podcast.lean_options and are
+    shared between hits, so treat them as read only.
+
+    Args:
+        max_entries (int): Most Podcasts kept in memory, None for no limit
+        max_bytes (int): Most memory_footprint() bytes kept in memory, None
+            for no limit
+        directory (str): Also pickle Podcasts to this directory, so they
+            survive eviction and restarts
+
+    Attributes:
+        hits (int): Lookups answered from memory
+        disk_hits (int): Lookups answered from the directory
+        misses (int): Lookups that parsed the feed
+        evictions (int): Podcasts dropped from memory
+        size (int): memory_footprint() bytes of the Podcasts in memory
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=None, directory=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def parse(self, feed_content, **options):
+        """Returns the cached Podcast for feed_content, parsing it if needed
+
+        Args:
+            feed_content (str): An rss string or bytes
+            **options: Passed on to Podcast
+        """
+        options = Podcast.lean_options(options)
+        key = content_hash(feed_content, options)
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is not None:
+                self.entries[key] = entry
+                self.hits += 1
+                return entry[0]
+        podcast = self.load(key)
+        if podcast is None:
+            podcast = Podcast(feed_content, **options)
+            self.save(key, podcast)
+        self.add(key, podcast)
+        return podcast
+
+    def stats(self):
+        """Returns the counters as a dict"""
+        return {
+            'entries': len(self.entries),
+            'size': self.size,
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    def clear(self):
+        """Empties the memory tier and the directory"""
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+        if self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith('.pickle'):
+                    os.remove(os.path.join(self.directory, name))
+
+    def add(self, key, podcast):
+        size = podcast.memory_footprint()
+        with self.lock:
+            if key in self.entries:
+                return
+            self.entries[key] = (podcast, size)
+            self.size += size
+            while self.entries and self.is_full():
+                evicted_size = self.entries.popitem(last=False)[1][1]
+                self.size -= evicted_size
+                self.evictions += 1
+
+    def is_full(self):
+        if self.max_entries is not None:
+            if len(self.entries) > self.max_entries:
+                return True
+        return self.max_bytes is not None and self.size > self.max_bytes
+
+    def path(self, key):
+        return os.path.join(self.directory, key + '.pickle')
+
+    def load(self, key):
+        """Returns the Podcast pickled under key and counts the lookup"""
+        if self.directory is not None:
+            try:
+                with open(self.path(key), 'rb') as cache_file:
+                    podcast = pickle.load(cache_file)
+            except (IOError, OSError, EOFError, pickle.UnpicklingError):
+                pass
+            else:
+                with self.lock:
+                    self.disk_hits += 1
+                return podcast
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def save(self, key, podcast):
+        """Pickles podcast under key, replacing the file atomically"""
+        if self.directory is None:
+            return
+        handle, temp_path = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(handle, 'wb') as cache_file:
+                pickle.dump(podcast, cache_file, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.path(key))
+        except BaseException:
+            os.remove(temp_path)
+            raise
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+from collections import namedtuple
+import threading
+import zlib
+
+try:
+    from http import client as http_client
+    from urllib.parse import urljoin, urlsplit
+except ImportError:
+    import httplib as http_client
+    from urlparse import urljoin, urlsplit
+
+import pyPodcastParser
+from pyPodcastParser.Podcast import Podcast
+from pyPodcastParser.StreamParser import CHUNK_SIZE
+
+
+class FetchResult(namedtuple(
+        'FetchResult', ['url', 'status', 'podcast', 'etag', 'last_modified'])):
+    """The outcome of FeedFetcher.fetch
+
+    Attributes:
+        url (str): The url the feed was finally fetched from
+        status (int): HTTP status, 304 when the feed was not modified
+        podcast (Podcast): The parsed feed, None when not modified
+        etag (str): ETag to send with the next fetch
+        last_modified (str): Last-Modified to send with the next fetch
+    """
+    __slots__ = ()
+
+
+REDIRECTS = (301, 302, 303, 307, 308)
+RETRIED_ERRORS = (http_client.BadStatusLine, http_client.CannotSendRequest,
+                  http_client.ResponseNotReady, IOError)
+
+
+class FetchError(Exception):
+    """Raised when a feed cannot be fetched
+
+    Attributes:
+        url (str): The url that failed
+        status (int): The HTTP status, None if there was no response
+    """
+
+    def __init__(self, message, url, status=None):
+        super(FetchError, self).__init__(message)
+        self.url = url
+        self.status = status
+
+
+def decompress(chunks, content_encoding):
+    """Decodes gzip or deflate compressed chunks one chunk at a time"""
+    content_encoding = (content_encoding or '').strip().lower()
+    if content_encoding in ('gzip', 'x-gzip'):
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    elif content_encoding == 'deflate':
+        decompressor = None
+    else:
+        for chunk in chunks:
+            yield chunk
+        return
+    for chunk in chunks:
+        if decompressor is None:
+            # Servers send deflate both with and without the zlib header
+            header = bytearray(chunk[:2])
+            if len(header) == 2 and (header[0] * 256 + header[1]) % 31 == 0:
+                decompressor = zlib.decompressobj()
+            else:
+                decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        data = decompressor.decompress(chunk)
+        if data:
+            yield data
+    if decompressor is not None:
+        data = decompressor.flush()
+        if data:
+            yield data
+
+
+class FeedFetcher(object):
+    """Fetches and parses feeds over pooled HTTP connections
+
+    Connections are kept alive and reused per host. Fetches with the etag and
+    last_modified of the previous FetchResult are conditional, so an
+    unchanged feed costs a 304 and no parse. Bodies are decompressed and
+    handed to the stream engine as they arrive.
+
+    Safe to share between threads. At most max_per_host fetches run at once
+    for each host; other threads wait for their turn.
+
+    Args:
+        max_per_host (int): Concurrent fetches and pooled connections per host
+        timeout (float): Socket timeout in seconds
+        max_redirects (int): Redirects followed before giving up
+        chunk_size (int): Bytes read from the socket at once
+        user_agent (str): The User-Agent header
+    """
+
+    def __init__(self, max_per_host=2, timeout=30, max_redirects=5,
+                 chunk_size=CHUNK_SIZE, user_agent=None):
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self.chunk_size = chunk_size
+        if user_agent is None:
+            user_agent = 'pyPodcastParser/%s' % pyPodcastParser.__version__
+        self.user_agent = user_agent
+        self.lock = threading.Lock()
+        self.idle_connections = {}
+        self.host_slots = {}
+
+    def fetch(self, url, etag=None, last_modified=None, **options):
+        """Fetches url and parses it unless it was not modified
+
+        Args:
+            url (str): http or https url of the feed
+            etag (str): ETag of the last fetch
+            last_modified (str): Last-Modified of the last fetch
+            **options: Passed on to Podcast, the engine is always "stream"
+
+        Returns:
+            FetchResult: podcast is None when the server answered 304
+
+        Raises:
+            FetchError: On any status other than 200 and 304
+        """
+        headers = {
+            'Accept-Encoding': 'gzip, deflate',
+            'User-Agent': self.user_agent,
+        }
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        for _ in range(self.max_redirects + 1):
+            result = self.fetch_once(url, headers, options)
+            if result.status not in REDIRECTS:
+                return result
+            url = result.url
+        raise FetchError("Too many redirects", url)
+
+    def fetch_once(self, url, headers, options):
+        """Makes one request. A redirect is returned with the new url"""
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise FetchError("Unsupported url", url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        with self.get_host_slot(key):
+            connection, response = self.request(key, parts.netloc, path,
+                                                headers)
+            try:
+                return self.handle_response(url, response, headers, options)
+            finally:
+                # Drain a small known rest to keep the connection. A body
+                # left unread, e.g. when Limits stopped the parse, is not
+                # read into memory: the connection is closed instead.
+                if (not response.isclosed() and response.length is not None
+                        and response.length <= self.chunk_size):
+                    response.read()
+                if response.will_close or not response.isclosed():
+                    connection.close()
+                else:
+                    self.release_connection(key, connection)
+
+    def request(self, key, netloc, path, headers):
+        """Sends the request on a pooled connection, retrying stale ones"""
+        while True:
+            connection, reused = self.get_connection(key)
+            try:
+                connection.request('GET', path, headers=headers)
+                return connection, connection.getresponse()
+            except RETRIED_ERRORS as error:
+                connection.close()
+                if not reused:
+                    raise FetchError(str(error), key[0] + '://' + netloc)
+
+    def handle_response(self, url, response, headers, options):
+        status = response.status
+        etag = response.getheader('ETag')
+        last_modified = response.getheader('Last-Modified')
+        if status in REDIRECTS:
+            location = response.getheader('Location')
+            if not location:
+                raise FetchError("Redirect without Location", url, status)
+            return FetchResult(urljoin(url, location), status, None,
+                               etag, last_modified)
+        if status == 304:
+            # Servers may leave the validators out of a 304, keep the sent ones
+            return FetchResult(url, status, None,
+                               etag or headers.get('If-None-Match'),
+                               last_modified or
+                               headers.get('If-Modified-Since'))
+        if status != 200:
+            raise FetchError("HTTP %d %s" % (status, response.reason),
+                             url, status)
+        chunks = decompress(self.read_chunks(response),
+                            response.getheader('Content-Encoding'))
+        options['engine'] = 'stream'
+        podcast = Podcast(chunks, **options)
+        return FetchResult(url, status, podcast, etag, last_modified)
+
+    def read_chunks(self, response):
+        while True:
+            chunk = response.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def get_host_slot(self, key):
+        with self.lock:
+            if key not in self.host_slots:
+                self.host_slots[key] = threading.BoundedSemaphore(
+                    self.max_per_host)
+            return self.host_slots[key]
+
+    def get_connection(self, key):
+        """Returns an idle connection to the host, or a new one"""
+        with self.lock:
+            idle = self.idle_connections.get(key)
+            if idle:
+                return idle.pop(), True
+        scheme, host, port = key
+        if scheme == 'https':
+            connection_class = http_client.HTTPSConnection
+        else:
+            connection_class = http_client.HTTPConnection
+        return connection_class(host, port, timeout=self.timeout), False
+
+    def release_connection(self, key, connection):
+        with self.lock:
+            idle = self.idle_connections.setdefault(key, [])
+            if len(idle) < self.max_per_host:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def close(self):
+        """Closes every pooled connection"""
+        with self.lock:
+            for idle in self.idle_connections.values():
+                for connection in idle:
+                    connection.close()
+            self.idle_connections = {}
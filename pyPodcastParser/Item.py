@@ -1,6 +1,25 @@
-from datetime import datetime
-import email.utils
-from time import mktime
+from collections import namedtuple
+
+from pyPodcastParser import serialize
+from pyPodcastParser.DateParser import parse_date, parse_duration
+from pyPodcastParser.StreamParser import ElementIndex, tag_string
+from pyPodcastParser.fingerprint import fingerprint
+
+
+class ItemProjection(namedtuple(
+        'ItemProjection',
+        ['fields', 'handlers', 'extracted', 'extras', 'dates'])):
+    """How an Item parses only some of its fields
+
+    Attributes:
+        fields (frozenset): The requested fields
+        handlers (dict): The tag handlers that set a requested field
+        extracted (frozenset): Every field the handlers and dates need
+        extras (tuple): Fields set while parsing but not requested
+        dates (bool): Is a date field requested
+    """
+    __slots__ = ()
+
 
 class Item(object):
     """Parses an xml rss feed
@@ -10,10 +29,19 @@ class Item(object):
 
     Args:
         soup (bs4.BeautifulSoup): BeautifulSoup object representing a rss item
+        lazy (bool): Defer parsing until an attribute is first read. Dates
+            are then only parsed when time_published or date_time is read.
+        fingerprint_fields (tuple): Fields hashed into fingerprint once they
+            are extracted, None to skip fingerprinting
+        fields (set): Parse only these fields and date_fields. The others
+            are not set and raise AttributeError. None parses them all.
 
     Note:
         All attributes with empty or nonexistent element will have a value of None
 
+        Items use __slots__ and drop their soup once parsed, so a parsed Item
+        keeps nothing of the tree alive.
+
     Attributes:
         author (str): The author of the item
         comments (str): URL of comments
@@ -27,6 +55,7 @@ class Item(object):
         itunes_block (bool): It this Item blocked from itunes
         itunes_closed_captioned: (str): It is this item have closed captions
         itunes_duration (str): Duration of enclosure
+        itunes_duration_seconds (int): itunes_duration in seconds
         itunes_explicit (str): Is this item explicit. Should only be yes or clean.
         itune_image (str): URL of item cover art
         itunes_order (str): Override published_date order
@@ -35,181 +64,269 @@ class Item(object):
         link (str): The URL of item.
         published_date (str): Date item was published
         title (str): The title of item.
-        date_time (datetime): When published
+        time_published (int): When published as a unix timestamp
+        date_time (datetime): The day published, naive
+        published_datetime (datetime): When published, aware and in the
+            timezone of published_date
+        fingerprint (str): Hex digest of fingerprint_fields, None if not
+            fingerprinted
     """
 
-    def __init__(self, soup):
+    fields = (
+        'author', 'categories', 'comments', 'creative_commons', 'description',
+        'enclosure_url', 'enclosure_type', 'enclosure_length', 'guid',
+        'itunes_author_name', 'itunes_block', 'itunes_closed_captioned',
+        'itunes_duration', 'itunes_duration_seconds', 'itunes_explicit',
+        'itune_image', 'itunes_order', 'itunes_subtitle', 'itunes_summary',
+        'link', 'published_date', 'title',
+    )
+    date_fields = ('time_published', 'date_time', 'published_datetime')
+    serialized_fields = fields + date_fields
+    __slots__ = ('soup', 'fingerprint_fields', 'fingerprint',
+                 'projection') + fields + date_fields
+    projections = {}
+
+    def __init__(self, soup, lazy=False, fingerprint_fields=None,
+                 fields=None):
         #super(Item, self).__init__()
 
         self.soup = soup
-        self.set_rss_element()
-        self.set_itunes_element()
-
-        self.set_time_published()
-        self.set_dates_published()
+        self.fingerprint_fields = fingerprint_fields
+        if fields is None:
+            self.projection = None
+        else:
+            self.projection = self.get_projection(fields)
+        if not lazy:
+            self.set_fields()
+            if self.projection is None:
+                self.set_dates()
+
+    def __getattr__(self, name):
+        """Parses a lazy item the first time one of its fields is read"""
+        if name not in self.serialized_fields and name != 'fingerprint':
+            raise AttributeError(name)
+        projection = self.projection
+        if projection is not None:
+            if name not in projection.fields and name != 'fingerprint':
+                raise AttributeError("%s was not in the item fields parsed"
+                                     % name)
+            self.set_fields()
+        elif name in self.date_fields:
+            self.set_dates()
+        else:
+            self.set_fields()
+        return object.__getattribute__(self, name)
 
-    def set_time_published(self):
-        if self.published_date is None:
-            return
-        time_tuple = email.utils.parsedate_tz(self.published_date)
+    @classmethod
+    def get_projection(cls, fields):
+        """Returns the ItemProjection of fields, built once per field set"""
+        fields = frozenset(fields)
         try:
-            self.time_published = email.utils.mktime_tz(time_tuple)
-        except TypeError:
-            self.time_published = None
+            return cls.projections[fields]
+        except KeyError:
+            pass
+        unknown = fields - frozenset(cls.serialized_fields)
+        if unknown:
+            raise ValueError("Unknown item fields: %s" %
+                             ', '.join(sorted(unknown)))
+        dates = bool(fields & frozenset(cls.date_fields))
+        wanted = fields - frozenset(cls.date_fields)
+        if dates:
+            wanted |= frozenset(['published_date'])
+        handlers = {}
+        extracted = set(wanted)
+        for name, tag_fields in cls.tag_fields.items():
+            if wanted & frozenset(tag_fields):
+                handlers[name] = cls.tag_handlers[name]
+                extracted.update(tag_fields)
+        projection = ItemProjection(
+            fields, handlers, frozenset(extracted),
+            tuple(extracted - fields) +
+            tuple(frozenset(cls.date_fields) - fields if dates else ()),
+            dates)
+        cls.projections[fields] = projection
+        return projection
+
+    def set_fields(self):
+        """Extracts every field, releases the soup and sets fingerprint
+
+        A projected item also sets its dates here, then drops the fields it
+        only extracted to set the requested ones.
+        """
+        self.set_defaults()
+        self.set_elements()
+        self.soup = None
+        projection = self.projection
+        if projection is not None:
+            if projection.dates:
+                self.set_dates()
+            for field in projection.extras:
+                delattr(self, field)
+        self.set_fingerprint()
+
+    def set_fingerprint(self):
+        if self.fingerprint_fields is None:
+            self.fingerprint = None
+        else:
+            self.fingerprint = fingerprint(self, self.fingerprint_fields)
 
-    def set_dates_published(self):
-        if self.published_date is None:
-            self.date_time = None
+    def set_defaults(self):
+        """Sets the value of every attribute whose element is missing"""
+        if self.projection is not None:
+            for field in self.projection.extracted:
+                setattr(self, field, self.default_value(field))
             return
-        time_tuple = email.utils.parsedate(self.published_date)
-        try:
-            temp_datetime = datetime(time_tuple[0], time_tuple[1], time_tuple[2])
-        except TypeError:
-            self.date_time = None
-            return
-        self.date_time = temp_datetime
-
-    def to_dict(self):
-        item = {}
-        item['author'] = self.author
-        item['comments'] = self.comments
-        item['creative_commons'] = self.creative_commons
-        item['enclosure_url'] = self.enclosure_url
-        item['enclosure_type'] = self.enclosure_type
-        item['enclosure_length'] = self.enclosure_length
-        item['enclosure_type'] = self.enclosure_type
-        item['guid'] = self.guid
-        item['itunes_author_name'] = self.itunes_author_name
-        item['itunes_block'] = self.itunes_block
-        item['itunes_closed_captioned'] = self.itunes_closed_captioned
-        item['itunes_duration'] = self.itunes_duration
-        item['itunes_explicit'] = self.itunes_explicit
-        item['itune_image'] = self.itune_image
-        item['itunes_order'] = self.itunes_order
-        item['itunes_subtitle'] = self.itunes_subtitle
-        item['itunes_summary'] = self.itunes_summary
-        item['link'] = self.link
-        item['published_date'] = self.published_date
-        item['title'] = self.title
-        return item
-
-    def set_rss_element(self):
-        """Set each of the basic rss elements."""
-        self.set_author()
-        self.set_categories()
-        self.set_comments()
-        self.set_creative_commons()
-        self.set_description()
-        self.set_enclosure()
-        self.set_guid()
-        self.set_link()
-        self.set_published_date()
-        self.set_title()
-
-    def set_author(self):
+        self.author = None
+        self.categories = []
+        self.comments = None
+        self.creative_commons = None
+        self.description = None
+        self.enclosure_url = None
+        self.enclosure_type = None
+        self.enclosure_length = None
+        self.guid = None
+        self.link = None
+        self.published_date = None
+        self.title = None
+        self.itunes_author_name = None
+        self.itunes_block = False
+        self.itunes_closed_captioned = None
+        self.itunes_duration = None
+        self.itunes_duration_seconds = None
+        self.itunes_explicit = None
+        self.itune_image = None
+        self.itunes_order = None
+        self.itunes_subtitle = None
+        self.itunes_summary = None
+
+    @staticmethod
+    def default_value(field):
+        if field == 'categories':
+            return []
+        if field == 'itunes_block':
+            return False
+        return None
+
+    def get_elements(self):
+        """Returns every element inside the item in document order"""
+        if isinstance(self.soup, ElementIndex):
+            return self.soup.elements
+        return self.soup.findAll(True)
+
+    def set_elements(self):
+        """Walks the item once and hands each element to its tag handler
+
+        Only the first element of a tag name is used, except for tags listed
+        in repeated_tags.
+        """
+        if self.projection is None:
+            handlers = self.tag_handlers
+        else:
+            handlers = self.projection.handlers
+        repeated_tags = self.repeated_tags
+        seen = set()
+        for tag in self.get_elements():
+            name = tag.name
+            if name in seen:
+                continue
+            handler = handlers.get(name)
+            if handler is None:
+                continue
+            if name not in repeated_tags:
+                seen.add(name)
+            handler(self, tag)
+
+    def set_dates(self):
+        """Parses published_date once into time_published and date_time"""
+        (self.time_published, self.date_time,
+         self.published_datetime) = parse_date(self.published_date)
+
+    def to_dict(self, fields=None):
+        """Returns the item as a dict
+
+        Args:
+            fields (tuple): Fields to include, all of fields by default or
+                the fields parsed by a projected item. time_published,
+                date_time and published_datetime may also be asked for.
+        """
+        if fields is None:
+            fields = self.get_parsed_fields()
+        else:
+            fields = serialize.get_fields(self.serialized_fields, fields)
+        return serialize.to_dict(self, fields)
+
+    def get_parsed_fields(self):
+        """Returns fields, or the projected fields in schema order"""
+        if self.projection is None:
+            return self.fields
+        return tuple(field for field in self.serialized_fields
+                     if field in self.projection.fields)
+
+    def to_json(self, stream=None, fields=None):
+        """Returns the item as JSON, or writes it to stream
+
+        Dates are written in ISO 8601.
+
+        Args:
+            stream (file): Text file-like object to write to
+            fields (tuple): Fields to include, see to_dict
+        """
+        return serialize.write_json(
+            [serialize.ENCODER.encode(self.to_dict(fields))], stream)
+
+    def set_author(self, tag):
         """Parses author and set value."""
-        try:
-            self.author = self.soup.find('author').string
-        except AttributeError:
-            self.author = None
+        self.author = tag_string(tag)
 
-    def set_categories(self):
-        """Parses and set categories"""
-        self.categories = []
-        temp_categories = self.soup.findAll('category')
-        for category in temp_categories:
-            category_text = category.string
-            self.categories.append(category_text)
+    def set_category(self, tag):
+        """Parses a category and adds it to categories"""
+        self.categories.append(tag_string(tag))
 
-    def set_comments(self):
+    def set_comments(self, tag):
         """Parses comments and set value."""
-        try:
-            self.comments = self.soup.find('comments').string
-        except AttributeError:
-            self.comments = None
+        self.comments = tag_string(tag)
 
-    def set_creative_commons(self):
+    def set_creative_commons(self, tag):
         """Parses creative commons for item and sets value"""
-        try:
-            self.creative_commons = self.soup.find(
-                'creativecommons:license').string
-        except AttributeError:
-            self.creative_commons = None
+        self.creative_commons = tag_string(tag)
 
-    def set_description(self):
+    def set_description(self, tag):
         """Parses description and set value."""
-        try:
-            self.description = self.soup.find('description').string
-        except AttributeError:
-            self.description = None
+        self.description = tag_string(tag)
 
-    def set_enclosure(self):
+    def set_enclosure(self, tag):
         """Parses enclosure_url, enclosure_type then set values."""
+        self.enclosure_url = tag.get('url')
+        self.enclosure_type = tag.get('type')
         try:
-            self.enclosure_url = self.soup.find('enclosure')['url']
-        except:
-            self.enclosure_url = None
-        try:
-            self.enclosure_type = self.soup.find('enclosure')['type']
-        except:
-            self.enclosure_type = None
-        try:
-            self.enclosure_length = self.soup.find('enclosure')['length']
-            self.enclosure_length = int(self.enclosure_length)
-        except:
+            self.enclosure_length = int(tag.get('length'))
+        except (TypeError, ValueError):
             self.enclosure_length = None
 
-    def set_guid(self):
+    def set_guid(self, tag):
         """Parses guid and set value"""
-        try:
-            self.guid = self.soup.find('guid').string
-        except AttributeError:
-            self.guid = None
+        self.guid = tag_string(tag)
 
-    def set_link(self):
+    def set_link(self, tag):
         """Parses link and set value."""
-        try:
-            self.link = self.soup.find('link').string
-        except AttributeError:
-            self.link = None
+        self.link = tag_string(tag)
 
-    def set_published_date(self):
+    def set_published_date(self, tag):
         """Parses published date and set value."""
-        try:
-            self.published_date = self.soup.find('pubdate').string
-        except AttributeError:
-            self.published_date = None
+        self.published_date = tag_string(tag)
 
-    def set_title(self):
+    def set_title(self, tag):
         """Parses title and set value."""
-        try:
-            self.title = self.soup.find('title').string
-        except AttributeError:
-            self.title = None
-
-    def set_itunes_element(self):
-        """Set each of the itunes elements."""
-        self.set_itunes_author_name()
-        self.set_itunes_block()
-        self.set_itunes_closed_captioned()
-        self.set_itunes_duration()
-        self.set_itunes_explicit()
-        self.set_itune_image()
-        self.set_itunes_order()
-        self.set_itunes_subtitle()
-        self.set_itunes_summary()
-
-    def set_itunes_author_name(self):
+        self.title = tag_string(tag)
+
+    def set_itunes_author_name(self, tag):
         """Parses author name from itunes tags and sets value"""
-        try:
-            self.itunes_author_name = self.soup.find('itunes:author').string
-        except AttributeError:
-            self.itunes_author_name = None
+        self.itunes_author_name = tag_string(tag)
 
-    def set_itunes_block(self):
+    def set_itunes_block(self, tag):
         """Check and see if item is blocked from iTunes and sets value"""
         try:
-            block = self.soup.find('itunes:block').string.lower()
+            block = tag_string(tag).lower()
         except AttributeError:
             block = ""
         if block == "yes":
@@ -217,55 +334,84 @@ class Item(object):
         else:
             self.itunes_block = False
 
-    def set_itunes_closed_captioned(self):
+    def set_itunes_closed_captioned(self, tag):
         """Parses isClosedCaptioned from itunes tags and sets value"""
         try:
-            self.itunes_closed_captioned = self.soup.find(
-                'itunes:isclosedcaptioned').string
-            self.itunes_closed_captioned = self.itunes_closed_captioned.lower()
+            self.itunes_closed_captioned = tag_string(tag).lower()
         except AttributeError:
             self.itunes_closed_captioned = None
 
-    def set_itunes_duration(self):
-        """Parses duration from itunes tags and sets value"""
-        try:
-            self.itunes_duration = self.soup.find('itunes:duration').string
-        except AttributeError:
-            self.itunes_duration = None
+    def set_itunes_duration(self, tag):
+        """Parses duration from itunes tags and sets it and its seconds"""
+        self.itunes_duration = tag_string(tag)
+        self.itunes_duration_seconds = parse_duration(self.itunes_duration)
 
-    def set_itunes_explicit(self):
+    def set_itunes_explicit(self, tag):
         """Parses explicit from itunes item tags and sets value"""
         try:
-            self.itunes_explicit = self.soup.find('itunes:explicit').string
-            self.itunes_explicit = self.itunes_explicit.lower()
+            self.itunes_explicit = tag_string(tag).lower()
         except AttributeError:
             self.itunes_explicit = None
 
-    def set_itune_image(self):
+    def set_itune_image(self, tag):
         """Parses itunes item images and set url as value"""
-        try:
-            self.itune_image = self.soup.find('itunes:image').get('href')
-        except AttributeError:
-            self.itune_image = None
+        self.itune_image = tag.get('href')
 
-    def set_itunes_order(self):
+    def set_itunes_order(self, tag):
         """Parses episode order and set url as value"""
         try:
-            self.itunes_order = self.soup.find('itunes:order').string
-            self.itunes_order = self.itunes_order.lower()
+            self.itunes_order = tag_string(tag).lower()
         except AttributeError:
             self.itunes_order = None
 
-    def set_itunes_subtitle(self):
+    def set_itunes_subtitle(self, tag):
         """Parses subtitle from itunes tags and sets value"""
-        try:
-            self.itunes_subtitle = self.soup.find('itunes:subtitle').string
-        except AttributeError:
-            self.itunes_subtitle = None
+        self.itunes_subtitle = tag_string(tag)
 
-    def set_itunes_summary(self):
+    def set_itunes_summary(self, tag):
         """Parses summary from itunes tags and sets value"""
-        try:
-            self.itunes_summary = self.soup.find('itunes:summary').string
-        except AttributeError:
-            self.itunes_summary = None
+        self.itunes_summary = tag_string(tag)
+
+    tag_handlers = {
+        'author': set_author,
+        'category': set_category,
+        'comments': set_comments,
+        'creativecommons:license': set_creative_commons,
+        'description': set_description,
+        'enclosure': set_enclosure,
+        'guid': set_guid,
+        'link': set_link,
+        'pubdate': set_published_date,
+        'title': set_title,
+        'itunes:author': set_itunes_author_name,
+        'itunes:block': set_itunes_block,
+        'itunes:isclosedcaptioned': set_itunes_closed_captioned,
+        'itunes:duration': set_itunes_duration,
+        'itunes:explicit': set_itunes_explicit,
+        'itunes:image': set_itune_image,
+        'itunes:order': set_itunes_order,
+        'itunes:subtitle': set_itunes_subtitle,
+        'itunes:summary': set_itunes_summary,
+    }
+    tag_fields = {
+        'author': ('author',),
+        'category': ('categories',),
+        'comments': ('comments',),
+        'creativecommons:license': ('creative_commons',),
+        'description': ('description',),
+        'enclosure': ('enclosure_url', 'enclosure_type', 'enclosure_length'),
+        'guid': ('guid',),
+        'link': ('link',),
+        'pubdate': ('published_date',),
+        'title': ('title',),
+        'itunes:author': ('itunes_author_name',),
+        'itunes:block': ('itunes_block',),
+        'itunes:isclosedcaptioned': ('itunes_closed_captioned',),
+        'itunes:duration': ('itunes_duration', 'itunes_duration_seconds'),
+        'itunes:explicit': ('itunes_explicit',),
+        'itunes:image': ('itune_image',),
+        'itunes:order': ('itunes_order',),
+        'itunes:subtitle': ('itunes_subtitle',),
+        'itunes:summary': ('itunes_summary',),
+    }
+    repeated_tags = frozenset(['category'])
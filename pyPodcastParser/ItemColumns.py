@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+from array import array
+from operator import attrgetter
+
+from pyPodcastParser.Item import Item
+
+
+class ItemColumns(object):
+    """The items of many Podcasts laid out one column per field
+
+    Each field is gathered for all of a Podcast's items at once, so no dict
+    is built per item. Numeric fields are kept in typed arrays that support
+    the buffer protocol, e.g. numpy.frombuffer(columns['time_published'],
+    dtype='int64'). Missing numbers are stored as 0 and flagged in valid.
+    Other fields are lists. Fields a Podcast did not parse are missing for
+    all of its items.
+
+    Args:
+        fields (tuple): Item fields to export, every field by default
+
+    Attributes:
+        fields (tuple): The exported fields
+        columns (dict): Field name to its list or array, plus podcast_index,
+            the position in add order of the Podcast each row came from
+        valid (dict): Numeric field name to a bytearray, 1 where the value
+            is present and 0 where it was None
+    """
+
+    numeric_fields = ('enclosure_length', 'itunes_duration_seconds',
+                      'time_published')
+    typecode = 'q'
+
+    def __init__(self, fields=None):
+        if fields is None:
+            fields = Item.fields + Item.date_fields
+        unknown = set(fields) - set(Item.fields + Item.date_fields)
+        if unknown:
+            raise ValueError("Unknown item fields: %s" %
+                             ', '.join(sorted(unknown)))
+        self.fields = tuple(fields)
+        self.columns = {'podcast_index': array(self.typecode)}
+        self.valid = {}
+        for field in self.fields:
+            if field in self.numeric_fields:
+                self.columns[field] = array(self.typecode)
+                self.valid[field] = bytearray()
+            else:
+                self.columns[field] = []
+        self.podcast_count = 0
+
+    @classmethod
+    def from_podcasts(cls, podcasts, fields=None):
+        """Returns the ItemColumns of every item of every Podcast"""
+        columns = cls(fields)
+        for podcast in podcasts:
+            columns.add(podcast)
+        return columns
+
+    def add(self, podcast):
+        """Appends the items of a Podcast as rows"""
+        items = list(podcast.items)
+        self.columns['podcast_index'].extend(
+            [self.podcast_count] * len(items))
+        self.podcast_count += 1
+        projection = podcast.item_projection
+        for field in self.fields:
+            if projection is None or field in projection:
+                values = list(map(attrgetter(field), items))
+            else:
+                values = [None] * len(items)
+            if field in self.valid:
+                self.valid[field].extend(
+                    [value is not None for value in values])
+                self.columns[field].extend(
+                    [0 if value is None else value for value in values])
+            else:
+                self.columns[field].extend(values)
+
+    def __len__(self):
+        return len(self.columns['podcast_index'])
+
+    def __getitem__(self, field):
+        return self.columns[field]
+
+    def __contains__(self, field):
+        return field in self.columns
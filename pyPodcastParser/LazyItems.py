@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+try:
+    from collections.abc import Sequence
+except ImportError:
+    from collections import Sequence
+
+from pyPodcastParser.Item import Item
+
+
+class LazyItems(Sequence):
+    """A read only list of Items that are only parsed when accessed
+
+    Each Item is created on first access and parses its elements the first
+    time one of its attributes is read. Created Items are kept, so reading
+    the same index twice returns the same object.
+
+    Args:
+        item_soups (list): The soup (or ElementIndex) of each item
+        fingerprint_fields (tuple): Passed on to each Item
+        fields (set): Passed on to each Item
+    """
+
+    def __init__(self, item_soups, fingerprint_fields=None, fields=None):
+        self.item_soups = item_soups
+        self.fingerprint_fields = fingerprint_fields
+        self.fields = fields
+        self.cache = [None] * len(item_soups)
+
+    def __len__(self):
+        return len(self.item_soups)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        item = self.cache[index]
+        if item is None:
+            item = Item(self.item_soups[index], lazy=True,
+                        fingerprint_fields=self.fingerprint_fields,
+                        fields=self.fields)
+            self.cache[index] = item
+        return item
+
+    def count_parsed(self):
+        """Counts Items that have been created. For debugging"""
+        return len(self.cache) - self.cache.count(None)
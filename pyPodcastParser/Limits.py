@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+
+TRUNCATE = 'truncate'
+DROP = 'drop'
+TEXT_OVERFLOWS = (TRUNCATE, DROP)
+
+
+class LimitExceeded(ValueError):
+    """Raised by strict Limits as soon as a feed goes over one of them
+
+    Attributes:
+        limit (str): Name of the limit, e.g. "max_items"
+    """
+
+    def __init__(self, limit, value):
+        ValueError.__init__(self, "Feed exceeds %s of %d" % (limit, value))
+        self.limit = limit
+
+
+class Limits(object):
+    """Bounds on what a guarded parse of a feed may hold in memory
+
+    Only the stream engine can be guarded, since a soup is built whole before
+    anything can be checked. Each limit is None for no limit.
+
+    Args:
+        max_bytes (int): Most input read, in bytes, or in characters for text.
+            The rest of the feed is never read.
+        max_items (int): Most items kept. Later items are tokenized but
+            nothing in them is recorded.
+        max_text_length (int): Most characters of text kept per element
+        text_overflow (str): "truncate" keeps the first max_text_length
+            characters of a longer text, "drop" sets it to None
+        max_depth (int): Most elements open at once. Deeper elements and
+            their text are skipped.
+        strict (bool): Raise LimitExceeded at the first limit exceeded
+            instead of degrading. Without strict the Podcast lists the limits
+            that were exceeded in limits_exceeded.
+    """
+
+    names = ('max_bytes', 'max_items', 'max_text_length', 'text_overflow',
+             'max_depth', 'strict')
+
+    def __init__(self, max_bytes=None, max_items=None, max_text_length=None,
+                 text_overflow=TRUNCATE, max_depth=None, strict=False):
+        if text_overflow not in TEXT_OVERFLOWS:
+            raise ValueError("Unknown text_overflow: %s" % text_overflow)
+        self.max_bytes = max_bytes
+        self.max_items = max_items
+        self.max_text_length = max_text_length
+        self.text_overflow = text_overflow
+        self.max_depth = max_depth
+        self.strict = strict
+
+    def __repr__(self):
+        return 'Limits(%s)' % ', '.join(
+            '%s=%r' % (name, getattr(self, name)) for name in self.names)
+
+
+class Guard(object):
+    """Applies Limits to a single parse and records the ones exceeded
+
+    Attributes:
+        limits (Limits): The limits applied
+        exceeded (list): Names of the limits exceeded, in order
+        truncated (bool): Was the input cut at max_bytes
+        read (int): Length of the chunks let through by limit_chunk
+    """
+
+    def __init__(self, limits):
+        self.limits = limits
+        self.exceeded = []
+        self.truncated = False
+        self.read = 0
+
+    def exceed(self, limit):
+        if self.limits.strict:
+            raise LimitExceeded(limit, getattr(self.limits, limit))
+        if limit not in self.exceeded:
+            self.exceeded.append(limit)
+
+    def limit_content(self, feed_content):
+        """Cuts a whole feed at max_bytes"""
+        max_bytes = self.limits.max_bytes
+        if max_bytes is None or len(feed_content) <= max_bytes:
+            return feed_content
+        self.exceed('max_bytes')
+        self.truncated = True
+        return feed_content[:max_bytes]
+
+    def limit_chunk(self, chunk):
+        """Returns the part of a chunk that fits in max_bytes
+
+        Once the input has been cut, truncated is set and every later chunk
+        is cut to nothing, so the caller should stop reading.
+        """
+        max_bytes = self.limits.max_bytes
+        if max_bytes is None:
+            return chunk
+        room = max_bytes - self.read
+        if len(chunk) > room:
+            if not self.truncated:
+                self.exceed('max_bytes')
+                self.truncated = True
+            chunk = chunk[:room]
+        self.read += len(chunk)
+        return chunk
+
+    def limit_chunks(self, chunks):
+        """Yields chunks up to max_bytes, then stops reading them"""
+        for chunk in chunks:
+            yield self.limit_chunk(chunk)
+            if self.truncated:
+                return
+
+    def limit_text(self, text, length):
+        """Returns the part of text that fits after length characters
+
+        Returns None when the text of the element is to be dropped.
+        """
+        room = self.limits.max_text_length - length
+        if len(text) <= room:
+            return text
+        self.exceed('max_text_length')
+        if self.limits.text_overflow == DROP:
+            return None
+        return text[:max(room, 0)]
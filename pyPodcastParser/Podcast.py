@@ -1,13 +1,26 @@
 # -*- coding: utf-8 -*-
 from bs4 import BeautifulSoup
-from datetime import datetime
-import email.utils
-from time import mktime
-
+import gc
+import mmap
+import os
+import sys
+import types
+
+from pyPodcastParser import serialize
+from pyPodcastParser.Changeset import Changeset
+from pyPodcastParser.DateParser import parse_date
+from pyPodcastParser.fingerprint import (
+    VOLATILE_FIELDS, fingerprint, fingerprint_fields)
 from pyPodcastParser.Item import Item
+from pyPodcastParser.LazyItems import LazyItems
+from pyPodcastParser.Limits import Guard
+from pyPodcastParser.StreamParser import (
+    AUTO, CHUNK_SIZE, ChunkDecoder, StopParsing, StreamParser, decode_chunks,
+    decode_feed, parse_feed, read_chunks, replay_soup, split_chunks,
+    tag_string)
 
 
-class Podcast():
+class Podcast(object):
     """Parses an xml rss feed
 
     RSS Specs http://cyber.law.harvard.edu/rss/rss.html
@@ -20,7 +33,28 @@ class Podcast():
     The cloud element aka RSS Cloud is not supported as it has been superseded by the superior PubSubHubbub protocal
 
     Args:
-        feed_content (str): An rss string
+        feed_content (str): An rss string or bytes. With the stream engine it
+            may also be an iterable of str or bytes chunks, or a closed
+            StreamParser, whose guard then replaces limits.
+        engine (str): "soup" parses with BeautifulSoup, "stream" tokenizes the
+            feed once with the StreamParser and builds no trees
+        lazy_items (bool): Make items a LazyItems sequence that only parses an
+            item when it is accessed
+        lean (bool): Release feed_content and every soup once the attributes
+            are set. Lazy items still keep their own soup until parsed.
+        backend (str): Tokenizer of the stream engine, "html.parser", "expat"
+            or "auto". auto uses expat for well formed feeds given whole and
+            html.parser otherwise.
+        fingerprints (bool): Set fingerprint on the Podcast and every Item
+            while parsing
+        fingerprint_exclude (tuple): Volatile fields left out of the
+            fingerprints, lastBuildDate by default
+        fields (set): Parse only these fields and derived_fields of the
+            channel. The others are not set and raise AttributeError.
+        item_fields (set): Parse only these fields of each Item, see Item.
+            enclosure_type is parsed too when is_valid_podcast is set.
+        limits (Limits): Guard the parse of the stream engine so it holds
+            memory in proportion to the limits rather than to the feed
 
     Note:
         All attributes with empty or nonexistent element will have a value of None
@@ -28,14 +62,18 @@ class Podcast():
         Attributes are generally strings or lists of strings, because we want to record the literal value of elements.
 
     Attributes:
-        feed_content (str): The actual xml of the feed
-        soup (bs4.BeautifulSoup): A soup of the xml with items and image removed
-        image_soup (bs4.BeautifulSoup): soup of image
-        full_soup (bs4.BeautifulSoup): A soup of the xml with items
+        feed_content (str): The actual xml of the feed, None for chunked input
+        soup (ElementIndex): Channel elements, without items and image
+        image_soup (Element): The channel image element
+        full_soup (bs4.BeautifulSoup): A soup of the xml, None for the stream
+            engine
+        item_soups (list): ElementIndex of each item
+        engine (str): The engine used to parse the feed
+        lean (bool): Were feed_content and the soups released after parsing
         categories (list): List for strings representing the feed categories
         copyright (str): The feed's copyright
         creative_commons (str): The feed's creative commons license
-        items (item): Item objects
+        items (item): Item objects, or a LazyItems sequence if lazy_items
         description (str): The feed's description
         generator (str): The feed's generator
         image_title (str): Feed image title
@@ -65,38 +103,325 @@ class Podcast():
         web_master (str): The feed's webmaster
         is_valid_rss (bool): Is this a valid RSS Feed
         is_valid_podcast (bool): Is this a valid Podcast
-        date_time (datetime): When published
+        date_time (datetime): The day published, naive
+        published_datetime (datetime): When published, aware and in the
+            timezone of published_date
+        fingerprint (str): Hex digest of the channel fields, without items.
+            None unless fingerprints is set.
+        limits_exceeded (list): Names of the limits the feed went over, so
+            empty unless the parse was degraded
     """
 
-    def __init__(self, feed_content):
+    ENGINES = ('soup', 'stream')
+
+    fields = (
+        'categories', 'copyright', 'creative_commons', 'description',
+        'generator', 'image_title', 'image_url', 'image_link', 'image_width',
+        'image_height', 'itunes_author_name', 'itunes_block',
+        'itunes_categories', 'itunes_complete', 'itunes_explicit',
+        'itune_image', 'itunes_keywords', 'itunes_new_feed_url', 'language',
+        'last_build_date', 'link', 'managing_editor', 'published_date',
+        'pubsubhubbub', 'owner_name', 'owner_email', 'subtitle', 'summary',
+        'title', 'ttl', 'web_master',
+    )
+    date_fields = ('time_published', 'date_time', 'published_datetime')
+    derived_fields = ('is_valid_rss', 'is_valid_podcast') + date_fields
+    __slots__ = ('feed_content', 'engine', 'lazy_items', 'lean',
+                 'fingerprints', 'fingerprint_exclude', 'fingerprint',
+                 'projection', 'item_projection', 'soup', 'full_soup',
+                 'image_soup', 'item_soups', 'items',
+                 'limits_exceeded') + fields + derived_fields
+    field_setters = dict((field, 'set_' + field) for field in fields)
+    field_setters.update({
+        'image_title': 'set_image', 'image_url': 'set_image',
+        'image_link': 'set_image', 'image_width': 'set_image',
+        'image_height': 'set_image', 'owner_name': 'set_owner',
+        'owner_email': 'set_owner',
+    })
+
+    def __init__(self, feed_content, engine='soup', lazy_items=False,
+                 lean=False, backend=AUTO, fingerprints=False,
+                 fingerprint_exclude=VOLATILE_FIELDS, fields=None,
+                 item_fields=None, limits=None):
         #super(Podcast, self).__init__()
-        self.feed_content = feed_content
-        self.set_soup()
-        self.set_full_soup()
-
-        self.set_extended_elements()
-        self.set_itunes()
-        self.set_optional_elements()
-        self.set_required_elements()
-
-        self.set_validity()
-        self.set_time_published()
-        self.set_dates_published()
-
-    def set_time_published(self):
-        if self.published_date is None:
-            self.time_published = None
-            return
-        time_tuple = email.utils.parsedate_tz(self.published_date)
-        self.time_published = email.utils.mktime_tz(time_tuple)
+        if engine not in self.ENGINES:
+            raise ValueError("Unknown engine: %s" % engine)
+        self.set_projection(fields, item_fields)
+        self.engine = engine
+        self.lazy_items = lazy_items
+        self.lean = lean
+        self.fingerprints = fingerprints
+        self.fingerprint_exclude = fingerprint_exclude
+        if isinstance(feed_content, (bytes, type(u''))):
+            self.feed_content = feed_content
+        elif engine == 'stream':
+            self.feed_content = None
+        else:
+            raise ValueError("Chunked feed content needs the stream engine")
+        if limits is None:
+            guard = None
+        elif engine == 'stream':
+            guard = Guard(limits)
+        else:
+            raise ValueError("Limits need the stream engine")
+        if engine == 'stream':
+            if isinstance(feed_content, StreamParser):
+                # Already tokenized, see PodcastParser
+                guard = feed_content.guard
+                self.full_soup = None
+                self.set_scopes(feed_content)
+            elif self.feed_content is None:
+                if guard is not None:
+                    feed_content = guard.limit_chunks(feed_content)
+                self.set_stream(decode_chunks(feed_content), backend, guard)
+            else:
+                if guard is not None:
+                    feed_content = guard.limit_content(feed_content)
+                self.set_stream([decode_feed(feed_content)], backend, guard)
+        else:
+            self.set_soup()
+        if guard is None:
+            self.limits_exceeded = []
+        else:
+            self.limits_exceeded = guard.exceeded
+
+        if self.projection is None:
+            self.set_extended_elements()
+            self.set_itunes()
+            self.set_optional_elements()
+            self.set_required_elements()
 
-    def set_dates_published(self):
-        if self.published_date is None:
-            self.date_time = None
+            self.set_validity()
+            self.set_dates()
+        else:
+            self.set_projected_fields()
+        self.set_fingerprint()
+        if lean:
+            self.release_soups()
+
+    def __getattr__(self, name):
+        if name in self.fields or name in self.derived_fields:
+            raise AttributeError("%s was not in the fields parsed" % name)
+        raise AttributeError(name)
+
+    def set_projection(self, fields, item_fields):
+        """Checks and sets projection and item_projection"""
+        self.projection, self.item_projection = self.get_projections(
+            fields, item_fields)
+
+    @classmethod
+    def get_projections(cls, fields, item_fields):
+        """Checks fields and item_fields and returns them as frozensets
+
+        Returns:
+            tuple: projection and item_projection, each None for all fields
+        """
+        if fields is None:
+            projection = None
+        else:
+            projection = frozenset(fields)
+            unknown = projection - frozenset(cls.fields + cls.derived_fields)
+            if unknown:
+                raise ValueError("Unknown fields: %s" %
+                                 ', '.join(sorted(unknown)))
+        if item_fields is None:
+            item_projection = None
+        else:
+            item_projection = Item.get_projection(item_fields).fields
+            if projection is None or 'is_valid_podcast' in projection:
+                # is_valid_podcast is computed from the enclosure types
+                item_projection = item_projection | frozenset(
+                    ['enclosure_type'])
+        return projection, item_projection
+
+    def set_projected_fields(self):
+        """Sets only the projected fields, and the items
+
+        Fields needed by the requested ones are set first, then dropped.
+        """
+        projection = self.projection
+        wanted = set(projection)
+        if 'is_valid_rss' in projection:
+            wanted.update(['title', 'link', 'description'])
+        dates = projection & frozenset(self.date_fields)
+        if dates:
+            wanted.add('published_date')
+        setters = []
+        for field in self.fields:
+            if field in wanted and self.field_setters[field] not in setters:
+                setters.append(self.field_setters[field])
+        for setter in setters:
+            getattr(self, setter)()
+        self.set_items()
+        if 'is_valid_rss' in projection:
+            self.set_is_valid_rss()
+        if 'is_valid_podcast' in projection:
+            self.set_is_valid_podcast()
+        set_fields = [field for field in self.fields
+                      if self.field_setters[field] in setters]
+        if dates:
+            self.set_dates()
+            set_fields.extend(self.date_fields)
+        for field in set_fields:
+            if field not in projection:
+                delattr(self, field)
+
+    def release_soups(self):
+        """Drops feed_content and the soups so only the attributes are kept"""
+        self.feed_content = None
+        self.soup = None
+        self.full_soup = None
+        self.image_soup = None
+        self.item_soups = None
+
+    def memory_footprint(self):
+        """Returns the approximate number of bytes retained by this Podcast
+
+        Follows every object reachable from the Podcast, including its items
+        and soups, and adds up their sizes. Shared objects such as classes,
+        modules and functions are not counted.
+        """
+        skipped_types = (type, types.ModuleType, types.FunctionType,
+                         types.BuiltinFunctionType)
+        seen = set()
+        pending = [self]
+        total = 0
+        while pending:
+            current = pending.pop()
+            if id(current) in seen or isinstance(current, skipped_types):
+                continue
+            seen.add(id(current))
+            total += sys.getsizeof(current)
+            pending.extend(gc.get_referents(current))
+        return total
+
+    @classmethod
+    def from_bytes(cls, buf, chunk_size=CHUNK_SIZE, **kwargs):
+        """Parses bytes with the stream engine, decoding one chunk at a time
+
+        Args:
+            buf (bytes): The feed as bytes or any bytes-like object
+            chunk_size (int): Number of bytes decoded and tokenized at once
+            **kwargs: Passed on to Podcast
+        """
+        return cls(split_chunks(buf, chunk_size), engine='stream', **kwargs)
+
+    @classmethod
+    def from_stream(cls, stream, chunk_size=CHUNK_SIZE, **kwargs):
+        """Parses a binary or text file-like object with the stream engine
+
+        Args:
+            stream (file): Any object with a read method
+            chunk_size (int): Number of bytes read and tokenized at once
+            **kwargs: Passed on to Podcast
+        """
+        return cls(read_chunks(stream, chunk_size), engine='stream', **kwargs)
+
+    @classmethod
+    def from_file(cls, path, chunk_size=CHUNK_SIZE, use_mmap=False, **kwargs):
+        """Parses a feed file with the stream engine
+
+        Args:
+            path (str): Path of the feed file
+            chunk_size (int): Number of bytes read and tokenized at once
+            use_mmap (bool): Memory map the file instead of reading it
+            **kwargs: Passed on to Podcast
+        """
+        with open(path, 'rb') as feed_file:
+            if not use_mmap:
+                return cls.from_stream(feed_file, chunk_size, **kwargs)
+            if os.fstat(feed_file.fileno()).st_size == 0:
+                return cls.from_bytes(b'', chunk_size, **kwargs)
+            feed_map = mmap.mmap(
+                feed_file.fileno(), 0, access=mmap.ACCESS_READ)
+            # Closing the chunks first releases their view of the map, which
+            # cannot be closed while it is exported
+            chunks = split_chunks(feed_map, chunk_size)
+            try:
+                return cls(chunks, engine='stream', **kwargs)
+            finally:
+                chunks.close()
+                feed_map.close()
+
+    @staticmethod
+    def new_items(feed_content, known_guids=None, since=None, backend=AUTO):
+        """Parses only the items that are newer than what was already seen
+
+        Items are read in feed order and parsing stops at the first known
+        item, so for newest first feeds only the start of the feed is read.
+
+        Args:
+            feed_content (str): An rss string
+            known_guids (set): guids of items that were already seen
+            since (int): time_published of the newest item already seen
+            backend (str): Tokenizer, see Podcast
+
+        Returns:
+            list: New Item objects in feed order
+        """
+        if known_guids is None:
+            known_guids = set()
+        found = []
+
+        def handle_item(item_soup, position):
+            del found[position:]
+            item = Item(item_soup)
+            if item.guid is not None and item.guid in known_guids:
+                raise StopParsing()
+            if since is not None and item.time_published is not None:
+                if item.time_published <= since:
+                    raise StopParsing()
+            found.append(item)
+
+        try:
+            parse_feed([decode_feed(feed_content)], backend, handle_item)
+        except StopParsing:
+            pass
+        return found
+
+    @staticmethod
+    def lean_options(options):
+        """Returns Podcast options for a Podcast that is kept or sent away
+
+        Lean mode without lazy items leaves only the attributes and Items, so
+        the Podcast is small to cache, safe to share and cheap to pickle.
+        """
+        options = dict(options)
+        options['lean'] = True
+        options['lazy_items'] = False
+        return options
+
+    def diff(self, other):
+        """Returns the Changeset from this parse to a later one of the feed
+
+        Args:
+            other (Podcast): The later parse
+
+        Returns:
+            Changeset: Items added, removed and modified, matched by guid
+                falling back to enclosure url
+        """
+        return Changeset(self, other)
+
+    def set_dates(self):
+        """Parses published_date once into time_published and date_time"""
+        (self.time_published, self.date_time,
+         self.published_datetime) = parse_date(self.published_date)
+
+    def get_fingerprint_fields(self, fields, projection=None):
+        """Returns the fields to fingerprint, None without fingerprints"""
+        if not self.fingerprints:
+            return None
+        if projection is not None:
+            fields = tuple(field for field in fields if field in projection)
+        return fingerprint_fields(fields, self.fingerprint_exclude)
+
+    def set_fingerprint(self):
+        fields = self.get_fingerprint_fields(self.fields, self.projection)
+        if fields is None:
+            self.fingerprint = None
         else:
-            time_tuple = email.utils.parsedate(self.published_date)
-            temp_datetime = datetime(time_tuple[0], time_tuple[1], time_tuple[2])
-            self.date_time = temp_datetime
+            self.fingerprint = fingerprint(self, fields)
 
     def set_validity(self):
         self.set_is_valid_rss()
@@ -110,53 +435,74 @@ class Podcast():
             self.is_valid_rss = False
 
     def set_is_valid_podcast(self):
-        for item in self.items:
-            if item.enclosure_type:
-                if item.enclosure_type.lower() == "audio/mpeg":
+        """Checks for an audio/mpeg enclosure in the items
+
+        Lazy items are not created for this, the enclosure types are read
+        from the item elements.
+        """
+        if self.lazy_items:
+            enclosure_types = (
+                enclosure.get('type') for enclosure in
+                (item_soup.find('enclosure') for item_soup in self.item_soups)
+                if enclosure is not None)
+        else:
+            enclosure_types = (item.enclosure_type for item in self.items)
+        for enclosure_type in enclosure_types:
+            if enclosure_type:
+                if enclosure_type.lower() == "audio/mpeg":
                     self.is_valid_podcast = True
                     return
         self.is_valid_podcast =  False
 
-    def to_dict(self):
-        podcast_dict = {}
-        podcast_dict['categories'] = self.categories
-        podcast_dict['copyright'] = self.copyright
-        podcast_dict['creative_commons'] = self.creative_commons
-        podcast_dict['description'] = self.description
-        podcast_dict['generator'] = self.generator
-        podcast_dict['image_title'] = self.image_title
-        podcast_dict['image_url'] = self.image_url
-        podcast_dict['image_link'] = self.image_link
-        podcast_dict['image_width'] = self.image_width
-        podcast_dict['image_height'] = self.image_height
-        podcast_dict['items'] = []
-        for item in self.items:
-            item_dict = item.to_dict()
-            podcast_dict['items'].append(item_dict)
-        podcast_dict['itunes_author_name'] = self.itunes_author_name
-        podcast_dict['itunes_block'] = self.itunes_block
-        podcast_dict['itunes_categories'] = self.itunes_categories
-        podcast_dict['itunes_block'] = self.itunes_block
-        podcast_dict['itunes_complete'] = self.image_width
-        podcast_dict['itunes_explicit'] = self.itunes_explicit
-        podcast_dict['itune_image'] = self.itune_image
-        podcast_dict['itunes_keywords'] = self.image_width
-        podcast_dict['itunes_explicit'] = self.itunes_explicit
-        podcast_dict['itunes_new_feed_url'] = self.itunes_new_feed_url
-        podcast_dict['language'] = self.language
-        podcast_dict['last_build_date'] = self.last_build_date
-        podcast_dict['link'] = self.link
-        podcast_dict['managing_editor'] = self.managing_editor
-        podcast_dict['published_date'] = self.published_date
-        podcast_dict['pubsubhubbub'] = self.pubsubhubbub
-        podcast_dict['owner_name'] = self.owner_name
-        podcast_dict['owner_email'] = self.owner_email
-        podcast_dict['subtitle'] = self.subtitle
-        podcast_dict['title'] = self.title
-        podcast_dict['ttl'] = self.ttl
-        podcast_dict['web_master'] = self.web_master
+    def to_dict(self, fields=None, item_fields=None):
+        """Returns the podcast as a dict, with its items as dicts
+
+        Args:
+            fields (tuple): Fields to include, all of fields and items by
+                default. Leave out items to skip them, derived_fields may
+                also be asked for.
+            item_fields (tuple): Fields of each item, see Item.to_dict
+        """
+        fields = self.get_serialized_fields(fields)
+        podcast_dict = serialize.to_dict(
+            self, tuple(field for field in fields if field != 'items'))
+        if 'items' in fields:
+            build_item = serialize.get_builder(
+                self.get_item_fields(item_fields))
+            podcast_dict['items'] = [build_item(item) for item in self.items]
         return podcast_dict
 
+    def to_json(self, stream=None, fields=None, item_fields=None):
+        """Returns the podcast as JSON, or streams it to stream item by item
+
+        Dates are written in ISO 8601.
+
+        Args:
+            stream (file): Text file-like object to write to
+            fields (tuple): Fields to include, see to_dict
+            item_fields (tuple): Fields of each item, see Item.to_dict
+        """
+        return serialize.write_json(serialize.iter_podcast_json(
+            self, self.get_serialized_fields(fields),
+            self.get_item_fields(item_fields)), stream)
+
+    def get_serialized_fields(self, fields):
+        if fields is None:
+            if self.projection is None:
+                return self.fields + ('items',)
+            return tuple(field for field in self.fields + self.derived_fields
+                         if field in self.projection) + ('items',)
+        return serialize.get_fields(
+            self.fields + self.derived_fields + ('items',), fields)
+
+    def get_item_fields(self, item_fields):
+        if item_fields is None:
+            if self.item_projection is None:
+                return Item.fields
+            return tuple(field for field in Item.serialized_fields
+                         if field in self.item_projection)
+        return serialize.get_fields(Item.serialized_fields, item_fields)
+
     def set_extended_elements(self):
         """Parses and sets non required elements"""
         self.set_creative_commons()
@@ -197,22 +543,51 @@ class Podcast():
         self.set_description()
 
     def set_soup(self):
-        """Sets soup and strips items"""
-        self.soup = BeautifulSoup(self.feed_content, "html.parser")
-        for item in self.soup.findAll('item'):
-            item.decompose()
-        for image in self.soup.findAll('image'):
-            image.decompose()
-
-    def set_full_soup(self):
-        """Sets soup and keeps items"""
+        """Sets full_soup, then soup, image_soup and item_soups from it
+
+        The tree is walked once and left untouched, the elements are recorded
+        by scope exactly as the stream engine does.
+        """
         self.full_soup = BeautifulSoup(self.feed_content, "html.parser")
+        parser = StreamParser(
+            backend=None, item_names=self.get_item_names(self.item_projection))
+        replay_soup(self.full_soup, parser)
+        parser.close()
+        self.set_scopes(parser)
+
+    def set_stream(self, chunks, backend=AUTO, guard=None):
+        """Tokenizes the feed once and sets soup, image_soup and item_soups"""
+        self.full_soup = None
+        self.set_scopes(parse_feed(chunks, backend,
+                                   item_names=self.get_item_names(
+                                       self.item_projection),
+                                   guard=guard))
+
+    @staticmethod
+    def get_item_names(item_projection):
+        """Returns the item elements an item projection needs, or None"""
+        if item_projection is None:
+            return None
+        return frozenset(Item.get_projection(item_projection).handlers)
+
+    def set_scopes(self, parser):
+        """Sets soup, image_soup and item_soups from a closed StreamParser"""
+        self.soup = parser.channel
+        self.image_soup = parser.image
+        self.item_soups = parser.items
 
     def set_items(self):
         self.items = []
-        full_soup_items = self.full_soup.findAll('item')
+        full_soup_items = self.item_soups
+        item_fields = self.get_fingerprint_fields(Item.fields,
+                                                  self.item_projection)
+        if self.lazy_items:
+            self.items = LazyItems(full_soup_items, item_fields,
+                                   self.item_projection)
+            return
         for full_soup_item in full_soup_items:
-            item = Item(full_soup_item)
+            item = Item(full_soup_item, fingerprint_fields=item_fields,
+                        fields=self.item_projection)
             if item:
                 self.items.append(item)
 
@@ -221,82 +596,78 @@ class Podcast():
         self.categories = []
         temp_categories = self.soup.findAll('category')
         for category in temp_categories:
-            category_text = category.string
+            category_text = tag_string(category)
             self.categories.append(category_text)
 
     def count_items(self):
-        """Counts Items in full_soup and soup. For debugging"""
-        soup_items = self.soup.findAll('item')
-        full_soup_items = self.full_soup.findAll('item')
-        return len(soup_items), len(full_soup_items)
+        """Counts Items in soup and item_soups. For debugging"""
+        return len(self.soup.findAll('item')), len(self.item_soups)
 
     def set_copyright(self):
         """Parses copyright and set value"""
         try:
-            self.copyright = self.soup.find('copyright').string
+            self.copyright = tag_string(self.soup.find('copyright'))
         except AttributeError:
             self.copyright = None
 
     def set_creative_commons(self):
         """Parses creative commons for item and sets value"""
         try:
-            self.creative_commons = self.soup.find(
-                'creativecommons:license').string
+            self.creative_commons = tag_string(self.soup.find(
+                'creativecommons:license'))
         except AttributeError:
             self.creative_commons = None
 
     def set_description(self):
         """Parses description and sets value"""
         try:
-            self.description = self.soup.find('description').string
+            self.description = tag_string(self.soup.find('description'))
         except AttributeError:
             self.description = None
 
     def set_generator(self):
         """Parses feed generator and sets value"""
         try:
-            self.generator = self.soup.find('generator').string
+            self.generator = tag_string(self.soup.find('generator'))
         except AttributeError:
             self.generator = None
 
     def set_image(self):
         """Parses image element and set values"""
-        temp_soup = self.full_soup
-        for item in temp_soup.findAll('item'):
-            item.decompose()
-        image = temp_soup.find('image')
+        image = self.image_soup
         try:
-            self.image_title = image.find('title').string
+            self.image_title = tag_string(image.find('title'))
         except AttributeError:
             self.image_title = None
         try:
-            self.image_url = image.find('url').string
+            self.image_url = tag_string(image.find('url'))
         except AttributeError:
             self.image_url = None
         try:
-            self.image_link = image.find('link').string
+            self.image_link = tag_string(image.find('link'))
         except AttributeError:
             self.image_link = None
         try:
-            self.image_width = image.find('width').string
+            self.image_width = tag_string(image.find('width'))
         except AttributeError:
             self.image_width = None
         try:
-            self.image_height = image.find('height').string
+            self.image_height = tag_string(image.find('height'))
         except AttributeError:
             self.image_height = None
 
     def set_itunes_author_name(self):
         """Parses author name from itunes tags and sets value"""
         try:
-            self.itunes_author_name = self.soup.find('itunes:author').string
+            self.itunes_author_name = tag_string(self.soup.find(
+                'itunes:author'))
         except AttributeError:
             self.itunes_author_name = None
 
     def set_itunes_block(self):
         """Check and see if podcast is blocked from iTunes and sets value"""
         try:
-            block = self.soup.find('itunes:block').string.lower()
+            block = tag_string(self.soup.find('itunes:block')).lower()
         except AttributeError:
             block = ""
         if block == "yes":
@@ -315,7 +686,8 @@ class Podcast():
     def set_itunes_complete(self):
         """Parses complete from itunes tags and sets value"""
         try:
-            self.itunes_complete = self.soup.find('itunes:complete').string
+            self.itunes_complete = tag_string(self.soup.find(
+                'itunes:complete'))
             self.itunes_complete = self.itunes_complete.lower()
         except AttributeError:
             self.itunes_complete = None
@@ -323,7 +695,8 @@ class Podcast():
     def set_itunes_explicit(self):
         """Parses explicit from itunes tags and sets value"""
         try:
-            self.itunes_explicit = self.soup.find('itunes:explicit').string
+            self.itunes_explicit = tag_string(self.soup.find(
+                'itunes:explicit'))
             self.itunes_explicit = self.itunes_explicit.lower()
         except AttributeError:
             self.itunes_explicit = None
@@ -338,7 +711,7 @@ class Podcast():
     def set_itunes_keywords(self):
         """Parses itunes keywords and set value"""
         try:
-            keywords = self.soup.find('itunes:keywords').string
+            keywords = tag_string(self.soup.find('itunes:keywords'))
         except AttributeError:
             keywords = None
         try:
@@ -351,43 +724,43 @@ class Podcast():
     def set_itunes_new_feed_url(self):
         """Parses new feed url from itunes tags and sets value"""
         try:
-            self.itunes_new_feed_url = self.soup.find(
-                'itunes:new-feed-url').string
+            self.itunes_new_feed_url = tag_string(self.soup.find(
+                'itunes:new-feed-url'))
         except AttributeError:
             self.itunes_new_feed_url = None
 
     def set_language(self):
         """Parses feed language and set value"""
         try:
-            self.language = self.soup.find('language').string
+            self.language = tag_string(self.soup.find('language'))
         except AttributeError:
             self.language = None
 
     def set_last_build_date(self):
         """Parses last build date and set value"""
         try:
-            self.last_build_date = self.soup.find('lastbuilddate').string
+            self.last_build_date = tag_string(self.soup.find('lastbuilddate'))
         except AttributeError:
             self.last_build_date = None
 
     def set_link(self):
         """Parses link to homepage and set value"""
         try:
-            self.link = self.soup.find('link').string
+            self.link = tag_string(self.soup.find('link'))
         except AttributeError:
             self.link = None
 
     def set_managing_editor(self):
         """Parses managing editor and set value"""
         try:
-            self.managing_editor = self.soup.find('managingeditor').string
+            self.managing_editor = tag_string(self.soup.find('managingeditor'))
         except AttributeError:
             self.managing_editor = None
 
     def set_published_date(self):
         """Parses published date and set value"""
         try:
-            self.published_date = self.soup.find('pubdate').string
+            self.published_date = tag_string(self.soup.find('pubdate'))
         except AttributeError:
             self.published_date = None
 
@@ -404,45 +777,94 @@ class Podcast():
         """Parses owner name and email then sets value"""
         owner = self.soup.find('itunes:owner')
         try:
-            self.owner_name = owner.find('itunes:name').string
+            self.owner_name = tag_string(owner.find('itunes:name'))
         except AttributeError:
             self.owner_name = None
         try:
-            self.owner_email = owner.find('itunes:email').string
+            self.owner_email = tag_string(owner.find('itunes:email'))
         except AttributeError:
             self.owner_email = None
 
     def set_subtitle(self):
         """Parses subtitle and sets value"""
         try:
-            self.subtitle = self.soup.find('itunes:subtitle').string
+            self.subtitle = tag_string(self.soup.find('itunes:subtitle'))
         except AttributeError:
             self.subtitle = None
 
     def set_summary(self):
         """Parses summary and set value"""
         try:
-            self.summary = self.soup.find('itunes:summary').string
+            self.summary = tag_string(self.soup.find('itunes:summary'))
         except AttributeError:
             self.summary = None
 
     def set_title(self):
         """Parses title and set value"""
         try:
-            self.title = self.soup.title.string
+            self.title = tag_string(self.soup.find('title'))
         except AttributeError:
             self.title = None
 
     def set_ttl(self):
         """Parses summary and set value"""
         try:
-            self.ttl = self.soup.find('ttl').string
+            self.ttl = tag_string(self.soup.find('ttl'))
         except AttributeError:
             self.ttl = None
 
     def set_web_master(self):
         """Parses the feed's webmaster and sets value"""
         try:
-            self.web_master = self.soup.find('webmaster').string
+            self.web_master = tag_string(self.soup.find('webmaster'))
         except AttributeError:
             self.web_master = None
+
+
+class PodcastParser(object):
+    """Builds a Podcast from chunks that are pushed as they arrive
+
+    The push counterpart of Podcast(chunks, engine="stream"): feed decodes
+    and tokenizes one chunk and returns, so nothing waits for the next chunk,
+    and close builds the Podcast. As for any stream, the auto backend is
+    html.parser.
+
+    Args:
+        backend (str): Tokenizer, see Podcast
+        limits (Limits): See Podcast
+        **options: Passed on to Podcast, the engine is always "stream"
+
+    Attributes:
+        truncated (bool): Was the input cut at max_bytes. Later chunks are
+            ignored, so they need not be read.
+    """
+
+    def __init__(self, backend=AUTO, limits=None, **options):
+        if backend == AUTO:
+            backend = 'html.parser'
+        projection, item_projection = Podcast.get_projections(
+            options.get('fields'), options.get('item_fields'))
+        self.guard = None if limits is None else Guard(limits)
+        self.parser = StreamParser(
+            backend=backend,
+            item_names=Podcast.get_item_names(item_projection),
+            guard=self.guard)
+        self.decoder = ChunkDecoder()
+        self.options = options
+        self.options['engine'] = 'stream'
+
+    @property
+    def truncated(self):
+        return self.guard is not None and self.guard.truncated
+
+    def feed(self, chunk):
+        """Decodes and tokenizes a str or bytes chunk"""
+        if self.guard is not None:
+            chunk = self.guard.limit_chunk(chunk)
+        self.parser.feed(self.decoder.decode(chunk))
+
+    def close(self):
+        """Tokenizes the rest of the feed and returns the Podcast"""
+        self.parser.feed(self.decoder.decode(b'', True))
+        self.parser.close()
+        return Podcast(self.parser, **self.options)
@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime, timedelta
+import mmap
+import os
+import struct
+import tempfile
+
+from pyPodcastParser.DateParser import EPOCH, UTC_EPOCH, get_timezone
+from pyPodcastParser.fingerprint import VOLATILE_FIELDS
+from pyPodcastParser.Item import Item
+from pyPodcastParser.Podcast import Podcast
+
+
+MAGIC = b'PPSN'
+VERSION = 1
+# magic, version, reserved, string count, item count, channel field count,
+# item field count, then the offsets of the channel record, the item offset
+# table, the string offset table and the string data
+HEADER = struct.Struct('<4sHHIIIIQQQQ')
+U32 = struct.Struct('<I')
+U64 = struct.Struct('<Q')
+I64 = struct.Struct('<q')
+AWARE = struct.Struct('<qi')
+
+(NONE, FALSE, TRUE, INT, STRING, LIST, NAIVE_DATETIME, AWARE_DATETIME,
+ BIG_INT) = range(9)
+INT_RANGE = (-2 ** 63, 2 ** 63 - 1)
+CHANNEL_EXTRAS = ('engine', 'fingerprint', 'limits_exceeded')
+ITEM_EXTRAS = ('fingerprint',)
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot is truncated, corrupt or of another version"""
+
+
+def microseconds(delta):
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+class SnapshotWriter(object):
+    """Encodes a Podcast, interning every string once across the file"""
+
+    def __init__(self):
+        self.body = bytearray()
+        self.string_ids = {}
+        self.strings = []
+
+    def intern(self, string):
+        try:
+            return self.string_ids[string]
+        except KeyError:
+            self.string_ids[string] = len(self.strings)
+            self.strings.append(string)
+            return len(self.strings) - 1
+
+    def write_value(self, value):
+        body = self.body
+        if value is None:
+            body.append(NONE)
+        elif value is True:
+            body.append(TRUE)
+        elif value is False:
+            body.append(FALSE)
+        elif isinstance(value, int):
+            if INT_RANGE[0] <= value <= INT_RANGE[1]:
+                body.append(INT)
+                body += I64.pack(value)
+            else:
+                body.append(BIG_INT)
+                body += U32.pack(self.intern(str(value)))
+        elif isinstance(value, (list, tuple)):
+            body.append(LIST)
+            body += U32.pack(len(value))
+            for element in value:
+                self.write_value(element)
+        elif isinstance(value, datetime):
+            if value.tzinfo is None:
+                body.append(NAIVE_DATETIME)
+                body += I64.pack(microseconds(value - EPOCH))
+            else:
+                body.append(AWARE_DATETIME)
+                offset = value.utcoffset()
+                body += AWARE.pack(microseconds(value - UTC_EPOCH),
+                                   offset.days * 86400 + offset.seconds)
+        else:
+            body.append(STRING)
+            body += U32.pack(self.intern(value))
+
+    def write_record(self, obj, fields):
+        for field in fields:
+            self.write_value(getattr(obj, field))
+
+    def dumps(self, podcast):
+        channel_fields = get_channel_fields(podcast)
+        item_fields = get_item_fields(podcast)
+        field_ids = [self.intern(field)
+                     for field in channel_fields + item_fields]
+        schema_offset = HEADER.size
+        body = self.body
+        for field_id in field_ids:
+            body += U32.pack(field_id)
+        channel_offset = schema_offset + len(body)
+        self.write_record(podcast, channel_fields)
+        item_offsets = []
+        for item in podcast.items:
+            item_offsets.append(HEADER.size + len(body))
+            self.write_record(item, item_fields)
+
+        items_offset = HEADER.size + len(body)
+        for offset in item_offsets:
+            body += U64.pack(offset)
+        encoded = [string.encode('utf-8') for string in self.strings]
+        strings_offset = HEADER.size + len(body)
+        position = 0
+        for data in encoded:
+            body += U32.pack(position)
+            position += len(data)
+        body += U32.pack(position)
+        data_offset = HEADER.size + len(body)
+        body += b''.join(encoded)
+        header = HEADER.pack(
+            MAGIC, VERSION, 0, len(self.strings), len(item_offsets),
+            len(channel_fields), len(item_fields), channel_offset,
+            items_offset, strings_offset, data_offset)
+        return header + bytes(body)
+
+
+def get_channel_fields(podcast):
+    """Returns the channel fields of a Podcast that are set"""
+    if podcast.projection is None:
+        fields = podcast.fields + podcast.derived_fields
+    else:
+        fields = tuple(field
+                       for field in podcast.fields + podcast.derived_fields
+                       if field in podcast.projection)
+    return fields + CHANNEL_EXTRAS
+
+
+def get_item_fields(podcast):
+    """Returns the item fields of a Podcast's items that are set"""
+    if podcast.item_projection is None:
+        fields = Item.serialized_fields
+    else:
+        fields = tuple(field for field in Item.serialized_fields
+                       if field in podcast.item_projection)
+    return fields + ITEM_EXTRAS
+
+
+class Snapshot(object):
+    """A compact, versioned binary copy of a parsed Podcast
+
+    A snapshot holds the extracted fields of the Podcast and its Items, never
+    the feed or the soups, so loading one skips parsing entirely. Every
+    distinct string is stored once in a string table, and each item has an
+    entry in an offset table. Reading an item only decodes that item and the
+    strings it uses, so a memory mapped snapshot can serve single items
+    without reading the whole file.
+
+    Fields a snapshot does not have, like those left out by a projection or
+    added by a later version, are unset on the loaded objects and raise
+    AttributeError.
+
+    Args:
+        buf (bytes): The snapshot, as bytes, a bytearray or an mmap
+    """
+
+    def __init__(self, buf):
+        self.buf = buf
+        self.map = None
+        if len(buf) < HEADER.size:
+            raise SnapshotError("Not a podcast snapshot")
+        (magic, version, _, string_count, self.item_count,
+         channel_field_count, item_field_count, self.channel_offset,
+         self.items_offset, self.strings_offset,
+         self.data_offset) = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise SnapshotError("Not a podcast snapshot")
+        if version != VERSION:
+            raise SnapshotError("Unsupported snapshot version %d" % version)
+        if (len(buf) < self.data_offset or len(buf) < self.data_offset +
+                U32.unpack_from(buf, self.strings_offset + 4 * string_count)[0]):
+            raise SnapshotError("Truncated snapshot")
+        self.strings = [None] * string_count
+        field_ids = struct.unpack_from(
+            '<%dI' % (channel_field_count + item_field_count), buf,
+            HEADER.size)
+        fields = [self.get_string(field_id) for field_id in field_ids]
+        self.channel_fields = tuple(fields[:channel_field_count])
+        self.item_fields = tuple(fields[channel_field_count:])
+
+    @staticmethod
+    def dumps(podcast):
+        """Returns the snapshot of a Podcast as bytes"""
+        return SnapshotWriter().dumps(podcast)
+
+    @classmethod
+    def save(cls, podcast, path):
+        """Writes the snapshot of a Podcast to path, replacing it atomically"""
+        data = cls.dumps(podcast)
+        directory = os.path.dirname(os.path.abspath(path))
+        handle, temp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(handle, 'wb') as snapshot_file:
+                snapshot_file.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    @classmethod
+    def open(cls, path):
+        """Memory maps a snapshot file. Close it, or use it in a with block"""
+        with open(path, 'rb') as snapshot_file:
+            snapshot_map = mmap.mmap(snapshot_file.fileno(), 0,
+                                     access=mmap.ACCESS_READ)
+        try:
+            snapshot = cls(snapshot_map)
+        except BaseException:
+            snapshot_map.close()
+            raise
+        snapshot.map = snapshot_map
+        return snapshot
+
+    @classmethod
+    def load(cls, path):
+        """Reads a snapshot file and returns its Podcast"""
+        with open(path, 'rb') as snapshot_file:
+            return cls(snapshot_file.read()).podcast()
+
+    @classmethod
+    def loads(cls, data):
+        """Returns the Podcast of a snapshot given as bytes"""
+        return cls(data).podcast()
+
+    def close(self):
+        self.buf = None
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.item_count
+
+    def get_string(self, string_id):
+        """Decodes a string of the string table the first time it is used"""
+        string = self.strings[string_id]
+        if string is None:
+            start, end = struct.unpack_from(
+                '<II', self.buf, self.strings_offset + 4 * string_id)
+            string = self.buf[self.data_offset + start:
+                              self.data_offset + end].decode('utf-8')
+            self.strings[string_id] = string
+        return string
+
+    def read_value(self, offset):
+        """Returns the value at offset and the offset after it"""
+        buf = self.buf
+        tag = buf[offset]
+        if not isinstance(tag, int):
+            tag = ord(tag)
+        offset += 1
+        if tag == STRING:
+            return self.get_string(U32.unpack_from(buf, offset)[0]), offset + 4
+        if tag == NONE:
+            return None, offset
+        if tag == TRUE:
+            return True, offset
+        if tag == FALSE:
+            return False, offset
+        if tag == INT:
+            return I64.unpack_from(buf, offset)[0], offset + 8
+        if tag == LIST:
+            count = U32.unpack_from(buf, offset)[0]
+            offset += 4
+            values = []
+            for _ in range(count):
+                value, offset = self.read_value(offset)
+                values.append(value)
+            return values, offset
+        if tag == NAIVE_DATETIME:
+            value = I64.unpack_from(buf, offset)[0]
+            return EPOCH + timedelta(microseconds=value), offset + 8
+        if tag == BIG_INT:
+            value = int(self.get_string(U32.unpack_from(buf, offset)[0]))
+            return value, offset + 4
+        if tag == AWARE_DATETIME:
+            value, utc_offset = AWARE.unpack_from(buf, offset)
+            return ((UTC_EPOCH + timedelta(microseconds=value)).astimezone(
+                get_timezone(utc_offset)), offset + AWARE.size)
+        raise SnapshotError("Corrupt snapshot value at %d" % (offset - 1))
+
+    def read_record(self, obj, fields, offset, known_fields):
+        for field in fields:
+            value, offset = self.read_value(offset)
+            if field in known_fields:
+                setattr(obj, field, value)
+
+    def item(self, index):
+        """Decodes only the Item at index"""
+        if index < 0:
+            index += self.item_count
+        if not 0 <= index < self.item_count:
+            raise IndexError("Snapshot item index out of range")
+        offset = U64.unpack_from(self.buf, self.items_offset + 8 * index)[0]
+        return self.read_item(offset)
+
+    def items(self):
+        """Yields every Item in order"""
+        for index in range(self.item_count):
+            yield self.item(index)
+
+    def read_item(self, offset):
+        item = Item.__new__(Item)
+        item.soup = None
+        item.fingerprint_fields = None
+        item.fingerprint = None
+        known_fields = frozenset(Item.serialized_fields + ITEM_EXTRAS)
+        present = frozenset(self.item_fields) & frozenset(
+            Item.serialized_fields)
+        if present == frozenset(Item.serialized_fields):
+            item.projection = None
+        else:
+            item.projection = Item.get_projection(present)
+        self.read_record(item, self.item_fields, offset, known_fields)
+        return item
+
+    def podcast(self):
+        """Decodes the Podcast and all of its Items"""
+        podcast = Podcast.__new__(Podcast)
+        podcast.feed_content = None
+        podcast.engine = None
+        podcast.lazy_items = False
+        podcast.lean = True
+        podcast.fingerprint = None
+        podcast.fingerprint_exclude = VOLATILE_FIELDS
+        podcast.limits_exceeded = []
+        podcast.release_soups()
+        all_fields = frozenset(Podcast.fields + Podcast.derived_fields)
+        present = frozenset(self.channel_fields) & all_fields
+        if present == all_fields:
+            podcast.projection = None
+        else:
+            podcast.projection = present
+        item_present = frozenset(self.item_fields) & frozenset(
+            Item.serialized_fields)
+        if item_present == frozenset(Item.serialized_fields):
+            podcast.item_projection = None
+        else:
+            podcast.item_projection = item_present
+        self.read_record(podcast, self.channel_fields, self.channel_offset,
+                         all_fields | frozenset(CHANNEL_EXTRAS))
+        podcast.fingerprints = podcast.fingerprint is not None
+        podcast.items = list(self.items())
+        return podcast
@@ -0,0 +1,703 @@
+# -*- coding: utf-8 -*-
+import codecs
+import re
+from xml.parsers import expat
+
+from bs4.element import NavigableString, Tag
+
+try:
+    from html.parser import HTMLParser
+except ImportError:
+    from HTMLParser import HTMLParser
+
+
+ENCODING_DECLARATION = re.compile(
+    br'^\s*<\?xml[^>]*encoding=["\']([A-Za-z0-9._-]+)["\']')
+BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+NAMESPACE_PREFIXES = {
+    'http://www.itunes.com/dtds/podcast-1.0.dtd': 'itunes',
+    'https://www.itunes.com/dtds/podcast-1.0.dtd': 'itunes',
+    'http://www.w3.org/2005/atom': 'atom',
+    'http://backend.userland.com/creativecommonsrssmodule': 'creativecommons',
+}
+CHUNK_SIZE = 64 * 1024
+HEAD_SIZE = 1024
+
+
+def detect_encoding(head):
+    """Returns the encoding of a feed from its first bytes
+
+    A byte order mark wins over the XML encoding declaration. Unknown
+    encodings and feeds without either fall back to utf-8.
+    """
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding
+    match = ENCODING_DECLARATION.match(head)
+    if match:
+        encoding = match.group(1).decode('ascii')
+        try:
+            return codecs.lookup(encoding).name
+        except LookupError:
+            pass
+    return 'utf-8'
+
+
+def tag_string(tag):
+    """Returns tag.string as a plain string
+
+    bs4.NavigableString keeps a reference to its tree, plain strings do not.
+    """
+    string = tag.string
+    if string is None:
+        return None
+    return type(u'')(string)
+
+
+def decode_feed(feed_content):
+    """Decodes bytes using the XML encoding declaration, defaulting to utf-8"""
+    if not isinstance(feed_content, bytes):
+        return feed_content
+    encoding = detect_encoding(feed_content[:HEAD_SIZE])
+    return feed_content.decode(encoding, 'replace')
+
+
+class ChunkDecoder(object):
+    """Decodes byte chunks pushed one at a time
+
+    The encoding is detected from the first HEAD_SIZE bytes, so decode
+    returns an empty string until that many have been seen. Text chunks are
+    returned unchanged.
+    """
+
+    def __init__(self):
+        self.decoder = None
+        self.head = b''
+
+    def decode(self, chunk, final=False):
+        if not isinstance(chunk, bytes):
+            return chunk
+        if self.decoder is None:
+            self.head += chunk
+            if len(self.head) < HEAD_SIZE and not final:
+                return u''
+            chunk, self.head = self.head, b''
+            self.decoder = codecs.getincrementaldecoder(
+                detect_encoding(chunk))('replace')
+        return self.decoder.decode(chunk, final)
+
+
+def decode_chunks(chunks):
+    """Decodes an iterable of byte chunks one chunk at a time
+
+    See ChunkDecoder.
+    """
+    decoder = ChunkDecoder()
+    for chunk in chunks:
+        yield decoder.decode(chunk)
+    yield decoder.decode(b'', True)
+
+
+def read_chunks(stream, chunk_size=CHUNK_SIZE):
+    """Reads a file-like object chunk_size characters or bytes at a time"""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def split_chunks(buf, chunk_size=CHUNK_SIZE):
+    """Splits a bytes-like object or mmap into chunks without copying it whole"""
+    with memoryview(buf) as view:
+        for start in range(0, len(view), chunk_size):
+            yield view[start:start + chunk_size].tobytes()
+
+
+class StopParsing(Exception):
+    """Raised by an item_handler to stop tokenizing the rest of the feed"""
+
+
+class Element(object):
+    """A single element recorded by the StreamParser
+
+    Mirrors the small part of the bs4.Tag interface used by Podcast and Item.
+
+    Attributes:
+        name (str): Lower cased tag name
+        attrs (dict): Attributes of the element
+        string (str): Text of the element, following the rules of bs4.Tag.string
+        children (ElementIndex): Descendants, only kept for scope elements
+    """
+    __slots__ = ('name', 'attrs', 'string', 'children')
+
+    def __init__(self, name, attrs, children=None):
+        self.name = name
+        self.attrs = attrs
+        self.string = None
+        self.children = children
+
+    def __getitem__(self, key):
+        return self.attrs[key]
+
+    def get(self, key, default=None):
+        return self.attrs.get(key, default)
+
+    def find(self, name):
+        return self.children.find(name)
+
+    def findAll(self, name):
+        return self.children.findAll(name)
+
+
+class ElementIndex(object):
+    """Elements of one scope (channel, image, item...) in document order
+
+    Attributes:
+        elements (list): Element objects in document order
+        first (dict): First Element for each tag name
+    """
+
+    def __init__(self):
+        self.elements = []
+        self.first = {}
+
+    def add(self, element):
+        self.elements.append(element)
+        if element.name not in self.first:
+            self.first[element.name] = element
+
+    def find(self, name):
+        return self.first.get(name)
+
+    def findAll(self, name):
+        return [element for element in self.elements if element.name == name]
+
+
+def partial_marker_length(data, marker):
+    """Returns the length of the start of marker that data ends with"""
+    for length in range(min(len(marker) - 1, len(data)), 0, -1):
+        if data.endswith(marker[:length]):
+            return length
+    return 0
+
+
+class HTMLParserBackend(HTMLParser):
+    """Tokenizes with html.parser, like BeautifulSoup's "html.parser" builder
+
+    Forgiving of feeds that are not well formed XML. Tag and attribute names
+    are lower cased by the tokenizer.
+
+    html.parser holds a CDATA section until its end arrives. With a
+    max_text_length, only its first max_text_length + 1 characters are
+    handed to html.parser, enough for the guard to see the text is too long,
+    so a huge section is never buffered whole.
+    """
+
+    CDATA_START = '<![CDATA['
+    CDATA_END = ']]>'
+
+    def __init__(self, target):
+        try:
+            HTMLParser.__init__(self, convert_charrefs=True)
+        except TypeError:
+            HTMLParser.__init__(self)
+        self.target = target
+        self.held = ''
+        # Characters of the current CDATA section, None outside of one
+        self.cdata_length = None
+
+    def feed(self, data):
+        if self.target.max_text_length is None:
+            HTMLParser.feed(self, data)
+            return
+        data = self.held + data
+        self.held = ''
+        while data:
+            if self.cdata_length is None:
+                data = self.feed_until_cdata(data)
+            else:
+                data = self.feed_cdata(data)
+
+    def feed_until_cdata(self, data):
+        """Feeds data up to a CDATA section and returns the rest"""
+        start = data.find(self.CDATA_START)
+        if start < 0:
+            held = partial_marker_length(data, self.CDATA_START)
+            self.held = data[len(data) - held:]
+            HTMLParser.feed(self, data[:len(data) - held])
+            return ''
+        HTMLParser.feed(self, data[:start])
+        # A "<" left unparsed means the marker is inside a comment, a tag...
+        if '<' not in self.rawdata:
+            self.cdata_length = 0
+        end = start + len(self.CDATA_START)
+        HTMLParser.feed(self, data[start:end])
+        return data[end:]
+
+    def feed_cdata(self, data):
+        """Feeds the part of a CDATA section under the limit, returns the rest"""
+        end = data.find(self.CDATA_END)
+        if end < 0:
+            held = partial_marker_length(data, self.CDATA_END)
+            self.held = data[len(data) - held:]
+            self.feed_cdata_text(data[:len(data) - held])
+            return ''
+        self.feed_cdata_text(data[:end])
+        self.cdata_length = None
+        HTMLParser.feed(self, self.CDATA_END)
+        return data[end + len(self.CDATA_END):]
+
+    def feed_cdata_text(self, text):
+        room = self.target.max_text_length + 1 - self.cdata_length
+        if room > 0:
+            HTMLParser.feed(self, text[:room])
+        self.cdata_length += len(text)
+
+    def close(self):
+        held, self.held = self.held, ''
+        if held:
+            if self.cdata_length is None:
+                HTMLParser.feed(self, held)
+            else:
+                self.feed_cdata_text(held)
+        HTMLParser.close(self)
+
+    def handle_starttag(self, tag, attrs):
+        self.target.handle_starttag(tag, dict(attrs))
+
+    def handle_endtag(self, tag):
+        self.target.handle_endtag(tag)
+
+    def handle_data(self, data):
+        self.target.handle_data(data)
+
+    def handle_comment(self, data):
+        self.target.add_separate_string(data)
+
+    def unknown_decl(self, data):
+        if data.upper().startswith('CDATA['):
+            data = data[len('CDATA['):]
+        self.target.add_separate_string(data)
+
+
+class ExpatBackend(object):
+    """Tokenizes with the expat C parser, which only accepts well formed XML
+
+    Namespace processing is off, so prefixed names such as "itunes:author"
+    are kept as written. Tag and attribute names are lower cased to match
+    html.parser. Expat normalizes line breaks, so feeds containing carriage
+    returns are left to html.parser by the auto backend.
+    """
+
+    def __init__(self, target):
+        self.target = target
+        self.parser = expat.ParserCreate()
+        self.parser.buffer_text = True
+        self.parser.StartElementHandler = self.handle_starttag
+        self.parser.EndElementHandler = self.handle_endtag
+        self.parser.CharacterDataHandler = self.handle_data
+        self.parser.CommentHandler = target.add_separate_string
+        self.parser.StartCdataSectionHandler = self.start_cdata
+        self.parser.EndCdataSectionHandler = self.end_cdata
+        self.cdata = None
+        self.cdata_length = 0
+
+    def feed(self, data):
+        self.parser.Parse(data, False)
+
+    def close(self):
+        self.parser.Parse('', True)
+
+    def handle_starttag(self, tag, attrs):
+        if attrs:
+            attrs = dict((key.lower(), value) for key, value in attrs.items())
+        self.target.handle_starttag(tag.lower(), attrs)
+
+    def handle_endtag(self, tag):
+        self.target.handle_endtag(tag.lower())
+
+    def handle_data(self, data):
+        if self.cdata is None:
+            self.target.handle_data(data)
+        elif (self.target.max_text_length is None or
+              self.cdata_length <= self.target.max_text_length):
+            # Past the limit the rest is cut by add_separate_string anyway
+            self.cdata.append(data)
+            self.cdata_length += len(data)
+
+    def start_cdata(self):
+        self.cdata = []
+        self.cdata_length = 0
+
+    def end_cdata(self):
+        self.target.add_separate_string(u''.join(self.cdata))
+        self.cdata = None
+
+
+BACKENDS = {
+    'html.parser': HTMLParserBackend,
+    'expat': ExpatBackend,
+}
+AUTO = 'auto'
+XML_ERRORS = (expat.ExpatError,)
+
+
+def choose_backend(chunks):
+    """Picks the backend used by the auto backend
+
+    A complete feed (a list of text chunks) is tokenized with expat unless it
+    contains carriage returns, which expat would normalize. Feeds that arrive
+    as a stream use html.parser, because a stream cannot be tokenized a
+    second time if it turns out not to be well formed XML.
+    """
+    if not isinstance(chunks, list):
+        return 'html.parser'
+    for chunk in chunks:
+        if u'\r' in chunk:
+            return 'html.parser'
+    return 'expat'
+
+
+def parse_feed(chunks, backend=AUTO, item_handler=None, item_names=None,
+               guard=None):
+    """Tokenizes chunks of text and returns the closed StreamParser
+
+    With the auto backend a complete feed that is not well formed XML is
+    tokenized again with html.parser, so item_handler may see the same
+    position twice.
+
+    Args:
+        chunks (iterable): Text chunks. A list is treated as a complete feed.
+        backend (str): "auto" or a key of BACKENDS
+        item_handler (callable): See StreamParser
+        item_names (set): See StreamParser
+        guard (Guard): See StreamParser
+    """
+    fallback = backend == AUTO
+    if fallback:
+        backend = choose_backend(chunks)
+        fallback = backend != 'html.parser'
+    parser = StreamParser(item_handler, backend, item_names, guard)
+    try:
+        for chunk in chunks:
+            parser.feed(chunk)
+        parser.close()
+    except XML_ERRORS:
+        if not fallback:
+            raise
+        parser = StreamParser(item_handler, 'html.parser', item_names, guard)
+        for chunk in chunks:
+            parser.feed(chunk)
+        parser.close()
+    return parser
+
+
+def replay_soup(soup, parser):
+    """Feeds the elements of a BeautifulSoup tree to a StreamParser
+
+    Walks the tree once without changing it. Strings other than plain text
+    (CDATA, comments...) are separate children, as they are in the tree.
+    """
+    text_type = type(u'')
+    pending = [iter(soup.contents)]
+    open_tags = []
+    while pending:
+        for node in pending[-1]:
+            if isinstance(node, Tag):
+                parser.handle_starttag(node.name, node.attrs)
+                pending.append(iter(node.contents))
+                open_tags.append(node.name)
+                break
+            elif type(node) is NavigableString:
+                parser.handle_data(node)
+            elif isinstance(node, NavigableString):
+                parser.add_separate_string(text_type(node))
+        else:
+            pending.pop()
+            if open_tags:
+                parser.handle_endtag(open_tags.pop())
+
+
+class StreamParser(object):
+    """Tokenizes a feed once and records every element by scope
+
+    The default tokenizer is the same one used by BeautifulSoup's
+    "html.parser" builder, so tag names are lower cased the same way. Instead
+    of building a tree, each element is recorded in the index of the scope it
+    belongs to:
+
+    * channel: everything outside of item and image elements
+    * image: everything inside the first channel image element
+    * items: one index per item element
+
+    Prefixed names are matched by namespace rather than by prefix. When a
+    prefix is bound to one of NAMESPACE_PREFIXES, elements using it are
+    recorded under the usual prefix, so <it:author> is recorded as
+    "itunes:author" if "it" is bound to the iTunes namespace. Unbound
+    prefixes are kept as written.
+
+    Args:
+        item_handler (callable): Called with the ElementIndex and position of
+            each item as soon as the item is closed. It may raise StopParsing.
+        backend (str): The tokenizer, a key of BACKENDS. None when events
+            are fed directly, as replay_soup does.
+        item_names (set): Only record these elements in items, None for all
+        guard (Guard): Applies Limits on the items, the text and the depth
+            of the elements recorded, None for no limits
+
+    Attributes:
+        channel (ElementIndex): Channel level elements
+        image (Element): The first channel image element or None
+        items (list): ElementIndex for each item
+    """
+
+    ITEM = 'item'
+    SKIPPED_ITEM = 'skipped item'
+    SKIPPED = 'skipped'
+    IMAGE = 'image'
+    NESTED_SCOPES = ('itunes:owner',)
+
+    def __init__(self, item_handler=None, backend='html.parser',
+                 item_names=None, guard=None):
+        if backend is None:
+            self.backend = None
+        elif backend in BACKENDS:
+            self.backend = BACKENDS[backend](self)
+        else:
+            raise ValueError("Unknown backend: %s" % backend)
+        self.item_handler = item_handler
+        self.item_names = item_names
+        self.guard = guard
+        if guard is None:
+            self.max_text_length = None
+            self.max_depth = None
+        else:
+            self.max_text_length = guard.limits.max_text_length
+            self.max_depth = guard.limits.max_depth
+        self.skip_height = None
+        self.channel = ElementIndex()
+        self.image = None
+        self.items = []
+        self.open_elements = []
+        self.active_indexes = [self.channel]
+        self.in_item = False
+        self.in_image = False
+        self.namespaces = {}
+        self.names = {}
+
+    def feed(self, data):
+        self.backend.feed(data)
+
+    def handle_starttag(self, tag, attrs):
+        if self.skip_height is not None or (self.max_depth is not None and
+                                            self.is_too_deep()):
+            self.skip_element(tag)
+            return
+        self.flush_text()
+        previous_namespaces = None
+        for key in attrs:
+            if key.startswith('xmlns:'):
+                previous_namespaces = self.bind_namespaces(attrs)
+                break
+        tag = self.get_name(tag)
+        element = Element(tag, attrs)
+        open_element = OpenElement(element, self.active_indexes)
+        open_element.namespaces = previous_namespaces
+        if tag == self.ITEM and not self.in_item:
+            self.in_item = True
+            if self.has_room_for_item():
+                index = ElementIndex()
+                self.items.append(index)
+                self.active_indexes = [index]
+                open_element.scope = self.ITEM
+            else:
+                self.active_indexes = []
+                open_element.scope = self.SKIPPED_ITEM
+        elif tag == self.IMAGE and not self.in_item and not self.in_image:
+            element.children = ElementIndex()
+            if self.image is None:
+                self.image = element
+            self.active_indexes = [element.children]
+            self.in_image = True
+            open_element.scope = self.IMAGE
+        elif (self.in_item and self.item_names is not None and
+              tag not in self.item_names):
+            pass
+        else:
+            for index in self.active_indexes:
+                index.add(element)
+            if tag in self.NESTED_SCOPES and not self.in_item:
+                element.children = ElementIndex()
+                self.active_indexes = self.active_indexes + [element.children]
+                open_element.scope = tag
+        self.open_elements.append(open_element)
+
+    def handle_endtag(self, tag):
+        self.flush_text()
+        tag = self.get_name(tag)
+        for position in range(len(self.open_elements) - 1, -1, -1):
+            if self.open_elements[position].element.name == tag:
+                break
+        else:
+            return
+        while len(self.open_elements) > position:
+            self.close_element(self.open_elements.pop())
+
+    def is_too_deep(self):
+        if len(self.open_elements) < self.max_depth:
+            return False
+        self.guard.exceed('max_depth')
+        return True
+
+    def skip_element(self, tag):
+        """Opens an element past max_depth, recording nothing inside it
+
+        Skipped elements stay on the stack so end tags are matched as usual,
+        even with void or unclosed tags. Recording resumes once the stack is
+        back to the height it had when skipping started.
+        """
+        if self.skip_height is None:
+            self.flush_text()
+            self.skip_height = len(self.open_elements)
+        open_element = OpenElement(Element(self.get_name(tag), None),
+                                   self.active_indexes)
+        open_element.scope = self.SKIPPED
+        self.open_elements.append(open_element)
+
+    def has_room_for_item(self):
+        guard = self.guard
+        if (guard is None or guard.limits.max_items is None or
+                len(self.items) < guard.limits.max_items):
+            return True
+        guard.exceed('max_items')
+        return False
+
+    def limit_text(self, open_element, text):
+        """Returns the part of text an element may keep, None to drop it"""
+        if open_element.dropped:
+            return None
+        text = self.guard.limit_text(text, open_element.text_length)
+        if text is None:
+            open_element.dropped = True
+            open_element.text = []
+            return None
+        open_element.text_length += len(text)
+        return text
+
+    def bind_namespaces(self, attrs):
+        """Adds the prefixes declared in attrs and returns the old bindings"""
+        previous_namespaces = self.namespaces
+        self.namespaces = dict(previous_namespaces)
+        for key, value in attrs.items():
+            if key.startswith('xmlns:'):
+                self.namespaces[key[len('xmlns:'):]] = value
+        self.names = {}
+        return previous_namespaces
+
+    def get_name(self, tag):
+        """Returns the name an element is recorded under
+
+        Names are computed once per tag and set of namespace bindings, so
+        this is a dict lookup for nearly every element.
+        """
+        try:
+            return self.names[tag]
+        except KeyError:
+            pass
+        name = tag
+        prefix, colon, local_name = tag.partition(':')
+        if colon and prefix in self.namespaces:
+            uri = self.namespaces[prefix].strip().lower()
+            if uri in NAMESPACE_PREFIXES:
+                name = NAMESPACE_PREFIXES[uri] + ':' + local_name
+        self.names[tag] = name
+        return name
+
+    def handle_data(self, data):
+        if self.open_elements and self.skip_height is None:
+            if self.max_text_length is not None:
+                data = self.limit_text(self.open_elements[-1], data)
+                if not data:
+                    return
+            self.open_elements[-1].text.append(data)
+
+    def close(self):
+        # Input cut at max_bytes is incomplete, which expat would reject
+        if self.backend is not None and (self.guard is None or
+                                         not self.guard.truncated):
+            self.backend.close()
+        self.flush_text()
+        while self.open_elements:
+            self.close_element(self.open_elements.pop())
+
+    def add_separate_string(self, data):
+        """Adds a CDATA section or comment, never merged with its neighbours"""
+        if self.skip_height is not None:
+            return
+        self.flush_text()
+        if self.open_elements:
+            if self.max_text_length is not None:
+                data = self.limit_text(self.open_elements[-1], data)
+                if data is None:
+                    return
+            self.open_elements[-1].add_child(data)
+
+    def flush_text(self):
+        if self.open_elements:
+            self.open_elements[-1].flush_text()
+
+    def close_element(self, open_element):
+        if open_element.scope == self.SKIPPED:
+            if len(self.open_elements) <= self.skip_height:
+                self.skip_height = None
+            return
+        open_element.flush_text()
+        element = open_element.element
+        if open_element.child_count == 1 and not open_element.dropped:
+            element.string = open_element.child_string
+        if open_element.scope is not None:
+            self.active_indexes = open_element.restore
+            if open_element.scope == self.ITEM:
+                self.in_item = False
+                if self.item_handler is not None:
+                    self.item_handler(self.items[-1], len(self.items) - 1)
+            elif open_element.scope == self.SKIPPED_ITEM:
+                self.in_item = False
+            elif open_element.scope == self.IMAGE:
+                self.in_image = False
+        if open_element.namespaces is not None:
+            self.namespaces = open_element.namespaces
+            self.names = {}
+        if self.open_elements:
+            self.open_elements[-1].add_child(element.string)
+
+
+class OpenElement(object):
+    """Book keeping for an element whose end tag has not been seen yet"""
+    __slots__ = ('element', 'restore', 'scope', 'namespaces', 'text',
+                 'child_count', 'child_string', 'text_length', 'dropped')
+
+    def __init__(self, element, restore):
+        self.element = element
+        self.restore = restore
+        self.scope = None
+        self.namespaces = None
+        self.text = []
+        self.child_count = 0
+        self.child_string = None
+        self.text_length = 0
+        self.dropped = False
+
+    def add_child(self, string):
+        self.child_count += 1
+        self.child_string = string
+
+    def flush_text(self):
+        if self.text:
+            self.add_child(u''.join(self.text))
+            self.text = []
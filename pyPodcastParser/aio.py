@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""asyncio helpers that parse feeds without blocking the event loop
+
+Requires Python 3.7 or newer.
+"""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import functools
+
+from pyPodcastParser.Podcast import Podcast, PodcastParser
+
+
+class AsyncParser(object):
+    """Parses feeds in an executor so the event loop stays responsive
+
+    Args:
+        executor (concurrent.futures.Executor): Where Podcast objects are
+            built. Defaults to the event loop's default thread pool. With a
+            ProcessPoolExecutor, feeds are parsed with Podcast.lean_options.
+            parse_stream does not use a ProcessPoolExecutor, see
+            parse_stream.
+        max_concurrency (int): Maximum number of feeds parsed at once, None
+            for no limit
+
+    Attributes:
+        executor (concurrent.futures.Executor): The executor in use
+        max_concurrency (int): Maximum number of feeds parsed at once
+    """
+
+    def __init__(self, executor=None, max_concurrency=None):
+        self.executor = executor
+        self.max_concurrency = max_concurrency
+        self.semaphore = None
+
+    def get_semaphore(self):
+        if self.semaphore is None and self.max_concurrency is not None:
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self.semaphore
+
+    def get_options(self, options):
+        if isinstance(self.executor, ProcessPoolExecutor):
+            return Podcast.lean_options(options)
+        return options
+
+    async def parse(self, feed_content, **options):
+        """Builds a Podcast in the executor
+
+        Cancelling the awaiting task stops waiting for the result, but a feed
+        that is already being parsed runs to completion in the executor.
+
+        Args:
+            feed_content (str): Anything Podcast accepts
+            **options: Passed on to Podcast
+        """
+        loop = asyncio.get_running_loop()
+        build = functools.partial(
+            Podcast, feed_content, **self.get_options(options))
+        semaphore = self.get_semaphore()
+        if semaphore is None:
+            return await loop.run_in_executor(self.executor, build)
+        async with semaphore:
+            return await loop.run_in_executor(self.executor, build)
+
+    async def parse_stream(self, chunks, **options):
+        """Parses an async iterable of chunks while it is being received
+
+        Each chunk is tokenized by a PodcastParser in the executor as soon as
+        it arrives, so parsing overlaps with the download and no thread is
+        held while waiting for the next chunk. The next chunk is read once
+        the previous one is tokenized, so a slow parse slows down receiving
+        instead of buffering the body. Once the input is cut at max_bytes
+        the rest of the chunks are not read.
+
+        The parser cannot be shared with another process, so with a
+        ProcessPoolExecutor the chunks are tokenized in the event loop's
+        default thread pool instead.
+
+        Args:
+            chunks: An async iterable of str or bytes chunks
+            **options: Passed on to PodcastParser
+        """
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        if isinstance(executor, ProcessPoolExecutor):
+            executor = None
+        parser = PodcastParser(**options)
+        semaphore = self.get_semaphore()
+        if semaphore is not None:
+            await semaphore.acquire()
+        try:
+            async for chunk in chunks:
+                await loop.run_in_executor(executor, parser.feed, chunk)
+                if parser.truncated:
+                    break
+            return await loop.run_in_executor(executor, parser.close)
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+
+async def parse(feed_content, executor=None, **options):
+    """Builds a Podcast in an executor. See AsyncParser.parse"""
+    return await AsyncParser(executor).parse(feed_content, **options)
+
+
+async def parse_stream(chunks, executor=None, **options):
+    """Parses an async iterable of chunks. See AsyncParser.parse_stream"""
+    return await AsyncParser(executor).parse_stream(chunks, **options)
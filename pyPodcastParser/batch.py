@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+import multiprocessing
+
+from pyPodcastParser.Podcast import Podcast
+
+
+class BatchResult(namedtuple('BatchResult',
+                             ['index', 'podcast', 'error'])):
+    """The outcome of parsing one feed with parse_many
+
+    Attributes:
+        index (int): Position of the feed in the contents given to parse_many
+        podcast (Podcast): The lean Podcast, or None if parsing failed
+        error (str): "ExceptionName: message" if parsing failed, else None
+    """
+    __slots__ = ()
+
+
+def error_result(index, error):
+    return BatchResult(index, None, "%s: %s" % (type(error).__name__, error))
+
+
+def parse_one(task):
+    """Parses one feed and never raises"""
+    index, feed_content, options = task
+    try:
+        return BatchResult(index, Podcast(feed_content, **options), None)
+    except Exception as error:
+        return error_result(index, error)
+
+
+def parse_chunk(tasks):
+    """Parses a list of feeds. Runs in the worker processes"""
+    return [parse_one(task) for task in tasks]
+
+
+def iter_chunks(tasks, chunksize):
+    while True:
+        chunk = list(islice(tasks, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def parse_many(contents, workers=None, chunksize=1, **options):
+    """Parses many feeds across a process pool
+
+    Results are yielded as soon as each feed is parsed, so they are not in
+    the order of contents; use BatchResult.index to match them up. A feed
+    that fails to parse yields a BatchResult with an error instead of
+    stopping the batch, as does a feed content that cannot be sent to a
+    worker, e.g. a generator. When a worker dies, e.g. killed for using too
+    much memory, the feeds being parsed at that moment fail with a
+    BrokenProcessPool error and the rest are parsed in a new pool.
+
+    Podcasts are parsed with Podcast.lean_options.
+
+    Args:
+        contents (iterable): Feed contents, anything Podcast accepts
+        workers (int): Number of processes. Defaults to the number of CPUs.
+            With 1 the feeds are parsed in this process.
+        chunksize (int): Number of feeds sent to a worker at once
+        **options: Passed on to Podcast, e.g. engine="stream"
+
+    Yields:
+        BatchResult: One for each feed
+    """
+    options = Podcast.lean_options(options)
+    tasks = ((index, feed_content, options)
+             for index, feed_content in enumerate(contents))
+    if workers == 1:
+        for task in tasks:
+            yield parse_one(task)
+        return
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    chunks = iter_chunks(tasks, chunksize)
+    executor = ProcessPoolExecutor(workers)
+    running = {}
+    try:
+        while True:
+            # Only a few chunks are submitted ahead, so contents is read
+            # lazily and the results do not pile up
+            for chunk in islice(chunks, 2 * workers - len(running)):
+                running[executor.submit(parse_chunk, chunk)] = chunk
+            if not running:
+                return
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            broken = None
+            for future in done:
+                chunk = running.pop(future)
+                try:
+                    results = future.result()
+                except BrokenProcessPool as error:
+                    broken = error
+                    results = [error_result(task[0], error) for task in chunk]
+                except Exception as error:
+                    # e.g. a feed content that cannot be pickled
+                    results = [error_result(task[0], error) for task in chunk]
+                for result in results:
+                    yield result
+            if broken is not None:
+                for chunk in running.values():
+                    for task in chunk:
+                        yield error_result(task[0], broken)
+                running = {}
+                executor.shutdown()
+                executor = ProcessPoolExecutor(workers)
+    finally:
+        for future in running:
+            future.cancel()
+        executor.shutdown()
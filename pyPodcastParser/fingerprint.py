@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+import hashlib
+
+
+VOLATILE_FIELDS = ('last_build_date',)
+
+
+def new_digest():
+    try:
+        return hashlib.blake2b(digest_size=16)
+    except AttributeError:
+        return hashlib.md5()
+
+
+def update_value(digest, value):
+    """Feeds a field value to the digest, tagged with its type and length"""
+    if value is None:
+        digest.update(b'n')
+    elif value is True:
+        digest.update(b't')
+    elif value is False:
+        digest.update(b'f')
+    elif isinstance(value, (list, tuple)):
+        digest.update(('l%d:' % len(value)).encode('ascii'))
+        for element in value:
+            update_value(digest, element)
+    elif isinstance(value, int):
+        digest.update(('i%d:' % value).encode('ascii'))
+    else:
+        text = value.encode('utf-8')
+        digest.update(('s%d:' % len(text)).encode('ascii'))
+        digest.update(text)
+
+
+def fingerprint(obj, fields):
+    """Returns a hex digest of the given fields of an Item or Podcast
+
+    The digest only depends on the field names and values, so it is stable
+    across runs, engines and backends.
+    """
+    digest = new_digest()
+    for field in fields:
+        update_value(digest, field)
+        update_value(digest, getattr(obj, field))
+    return digest.hexdigest()
+
+
+def fingerprint_fields(fields, exclude):
+    """Returns fields without the excluded ones, keeping their order"""
+    exclude = frozenset(exclude)
+    return tuple(field for field in fields if field not in exclude)
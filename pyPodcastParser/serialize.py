@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+from datetime import date
+import json
+from operator import attrgetter
+
+
+def encode_default(value):
+    """Encodes the values json does not know, dates as ISO 8601"""
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError("%r is not JSON serializable" % (value,))
+
+
+ENCODER = json.JSONEncoder(default=encode_default)
+MAX_BUILDERS = 64
+BUILDERS = {}
+
+
+def get_builder(fields):
+    """Returns a function that builds the dict of fields of an object
+
+    All the fields are read by one attrgetter, built once per tuple of
+    fields and kept in BUILDERS, which is emptied once it holds
+    MAX_BUILDERS. Field names come from the class schemas, see get_fields.
+    """
+    try:
+        return BUILDERS[fields]
+    except KeyError:
+        pass
+    builder = make_builder(fields)
+    if len(BUILDERS) >= MAX_BUILDERS:
+        BUILDERS.clear()
+    BUILDERS[fields] = builder
+    return builder
+
+
+def make_builder(fields):
+    if not fields:
+        return lambda obj: {}
+    getter = attrgetter(*fields)
+    if len(fields) == 1:
+        field = fields[0]
+        return lambda obj: {field: getter(obj)}
+    return lambda obj: dict(zip(fields, getter(obj)))
+
+
+def get_fields(schema, fields):
+    """Checks requested fields against a schema, None meaning all of it"""
+    if fields is None:
+        return schema
+    fields = tuple(fields)
+    unknown = set(fields) - set(schema)
+    if unknown:
+        raise ValueError("Unknown fields: %s" % ', '.join(sorted(unknown)))
+    return fields
+
+
+def to_dict(obj, fields):
+    """Returns a dict of the given fields of an Item or Podcast"""
+    return get_builder(fields)(obj)
+
+
+def iter_podcast_json(podcast, fields, item_fields):
+    """Yields a Podcast as JSON, one piece per item
+
+    Only one item dict exists at a time, so the full dict of a large feed is
+    never built.
+    """
+    channel_fields = tuple(field for field in fields if field != 'items')
+    channel = ENCODER.encode(to_dict(podcast, channel_fields))
+    if 'items' not in fields:
+        yield channel
+        return
+    if channel_fields:
+        yield channel[:-1] + ', "items": ['
+    else:
+        yield '{"items": ['
+    separator = ''
+    for item in podcast.items:
+        yield separator
+        yield ENCODER.encode(to_dict(item, item_fields))
+        separator = ', '
+    yield ']}'
+
+
+def write_json(pieces, stream):
+    """Writes JSON pieces to stream, or joins them if stream is None"""
+    if stream is None:
+        return ''.join(pieces)
+    for piece in pieces:
+        stream.write(piece)
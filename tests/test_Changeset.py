@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+import os
+import unittest
+
+from pyPodcastParser.Podcast import Podcast
+
+ITEM = """<item>
+<title>%(title)s</title>
+%(guid)s
+<enclosure url="%(url)s" length="1" type="audio/mpeg"/>
+</item>"""
+
+FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel>
+<title>%(title)s</title>
+<link>http://example.com</link>
+<description>diff feed</description>
+%(items)s
+</channel></rss>"""
+
+
+def make_feed(items, title="diff title"):
+    rendered = []
+    for guid, url, item_title in items:
+        rendered.append(ITEM % {
+            'title': item_title,
+            'guid': '<guid>%s</guid>' % guid if guid else '',
+            'url': url,
+        })
+    return FEED % {'title': title, 'items': '\n'.join(rendered)}
+
+
+class Test_Changeset(unittest.TestCase):
+
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        feed_path = os.path.join(test_dir, 'test_feeds', 'basic_podcast.rss')
+        with open(feed_path, "r") as feed_file:
+            self.basic_podcast = feed_file.read()
+
+    def diff(self, old, new, **kwargs):
+        return Podcast(old, **kwargs).diff(Podcast(new, **kwargs))
+
+    def test_same_feed(self):
+        changeset = self.diff(self.basic_podcast, self.basic_podcast)
+        self.assertFalse(changeset)
+        self.assertEqual(changeset.unchanged, 2)
+        self.assertEqual(changeset.channel_fields, [])
+
+    def test_added_removed_modified(self):
+        old = make_feed([('a', 'http://e.com/a.mp3', 'A'),
+                         ('b', 'http://e.com/b.mp3', 'B'),
+                         ('c', 'http://e.com/c.mp3', 'C')])
+        new = make_feed([('d', 'http://e.com/d.mp3', 'D'),
+                         ('a', 'http://e.com/a.mp3', 'A'),
+                         ('b', 'http://e.com/b.mp3', 'B edited')])
+        changeset = self.diff(old, new)
+        self.assertTrue(changeset)
+        self.assertEqual([item.guid for item in changeset.added], ['d'])
+        self.assertEqual([item.guid for item in changeset.removed], ['c'])
+        self.assertEqual(len(changeset.modified), 1)
+        change = changeset.modified[0]
+        self.assertEqual((change.old.title, change.new.title),
+                         ('B', 'B edited'))
+        self.assertEqual(change.fields, ['title'])
+        self.assertEqual(changeset.unchanged, 1)
+
+    def test_enclosure_url_fallback(self):
+        old = make_feed([(None, 'http://e.com/a.mp3', 'A')])
+        new = make_feed([(None, 'http://e.com/a.mp3', 'A edited')])
+        changeset = self.diff(old, new, engine='stream')
+        self.assertEqual(changeset.added, [])
+        self.assertEqual(changeset.removed, [])
+        self.assertEqual(changeset.modified[0].fields, ['title'])
+
+    def test_duplicate_guids(self):
+        old = make_feed([('a', 'http://e.com/1.mp3', 'A'),
+                         ('a', 'http://e.com/2.mp3', 'A')])
+        new = make_feed([('a', 'http://e.com/1.mp3', 'A')])
+        changeset = self.diff(old, new)
+        self.assertEqual(changeset.unchanged, 1)
+        self.assertEqual([item.enclosure_url for item in changeset.removed],
+                         ['http://e.com/2.mp3'])
+
+    def test_channel_fields(self):
+        old = make_feed([], title="old title")
+        new = make_feed([], title="new title")
+        changeset = self.diff(old, new)
+        self.assertTrue(changeset)
+        self.assertEqual(changeset.channel_fields, ['title'])
+
+    def test_lazy_items(self):
+        old = make_feed([('a', 'http://e.com/a.mp3', 'A')])
+        new = make_feed([('a', 'http://e.com/a.mp3', 'A'),
+                         ('b', 'http://e.com/b.mp3', 'B')])
+        changeset = self.diff(old, new, lazy_items=True)
+        self.assertEqual([item.guid for item in changeset.added], ['b'])
+
+    def test_projected_podcasts(self):
+        old = make_feed([('a', 'http://e.com/a.mp3', 'A'),
+                         ('b', 'http://e.com/b.mp3', 'B')], title="old title")
+        new = make_feed([('a', 'http://e.com/a.mp3', 'A edited'),
+                         ('c', 'http://e.com/c.mp3', 'C')], title="new title")
+        changeset = self.diff(old, new, engine='stream', fields=('title',),
+                              item_fields=('guid', 'title'))
+        self.assertEqual(changeset.channel_fields, ['title'])
+        self.assertEqual([item.guid for item in changeset.added], ['c'])
+        self.assertEqual([item.guid for item in changeset.removed], ['b'])
+        self.assertEqual(changeset.modified[0].fields, ['title'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+import datetime
+import email.utils
+import unittest
+
+from pyPodcastParser.DateParser import DateParser, parse_duration
+
+
+class Test_Date_Parser(unittest.TestCase):
+
+    def setUp(self):
+        self.parser = DateParser()
+
+    def assertParses(self, date_string, timestamp, date):
+        self.assertEqual(self.parser.parse(date_string)[:2],
+                         (timestamp, datetime.datetime(*date)))
+
+    def test_matches_email_utils(self):
+        for date_string in ("Mon, 24 Mar 2008 23:30:07 GMT",
+                            "Fri, 21 Mar 2008 09:50:00 EDT",
+                            "Tue, 25 Mar 2008 02:00:00 -0800",
+                            "Sat, 01 Jan 2000 00:00:00 +1400",
+                            "Monday, 24 March 2008 23:30:07 GMT",
+                            "Mon, 24 Mar 08 9:30:07 PST",
+                            "24 Mar 2008 23:30 +0100"):
+            time_tuple = email.utils.parsedate_tz(date_string)
+            self.assertEqual(self.parser.parse(date_string)[:2],
+                             (email.utils.mktime_tz(time_tuple),
+                              datetime.datetime(*time_tuple[:3])))
+
+    def test_date_is_in_its_own_timezone(self):
+        self.assertParses("Tue, 25 Mar 2008 02:00:00 -0800",
+                          1206439200, (2008, 3, 25))
+
+    def test_aware_datetime(self):
+        published = self.parser.parse("Tue, 25 Mar 2008 02:00:00 -0800")[2]
+        self.assertEqual(published.utcoffset(),
+                         datetime.timedelta(hours=-8))
+        self.assertEqual((published.day, published.hour), (25, 2))
+        self.assertEqual(published, datetime.datetime(
+            2008, 3, 25, 10, tzinfo=datetime.timezone.utc))
+        published = self.parser.parse("Mon, 24 Mar 2008 23:30:07 GMT")[2]
+        self.assertEqual(published.utcoffset(), datetime.timedelta(0))
+
+    def test_iso_8601(self):
+        self.assertParses("2008-03-24T23:30:07Z", 1206401407, (2008, 3, 24))
+        self.assertParses("2008-03-24T23:30:07.5+05:30", 1206381607,
+                          (2008, 3, 24))
+
+    def test_malformed(self):
+        self.assertParses("Mon, 24 Mar 2008", 1206316800, (2008, 3, 24))
+        self.assertParses("Tue, 25 Mar 2008 10:00:00 +05:30", 1206419400,
+                          (2008, 3, 25))
+        self.assertParses("Mon, 24 Mar 2008 23:30:07 +0000 (UTC)",
+                          1206401407, (2008, 3, 24))
+        self.assertParses("Mon, 31 Feb 2008 23:30:07 GMT", 1204500607,
+                          (2008, 3, 2))
+
+    def test_not_a_date(self):
+        for date_string in (None, "", "garbage",
+                            "Mon, 24 Foo 2008 23:30:07 GMT"):
+            self.assertEqual(self.parser.parse(date_string),
+                             (None, None, None))
+
+    def test_cache(self):
+        result = self.parser.parse("Mon, 24 Mar 2008 23:30:07 GMT")
+        self.assertTrue(
+            self.parser.parse("Mon, 24 Mar 2008 23:30:07 GMT") is result)
+
+    def test_cache_is_bounded(self):
+        parser = DateParser(max_entries=2)
+        for day in range(1, 10):
+            parser.parse("%d Mar 2008 00:00:00 GMT" % day)
+            self.assertTrue(len(parser.cache) <= 2)
+
+
+class Test_Parse_Duration(unittest.TestCase):
+
+    def test_durations(self):
+        self.assertEqual(parse_duration("1:02:03"), 3723)
+        self.assertEqual(parse_duration("02:03"), 123)
+        self.assertEqual(parse_duration("123"), 123)
+        self.assertEqual(parse_duration(" 90.6 "), 91)
+        self.assertEqual(parse_duration("1:00:00.4"), 3600)
+
+    def test_not_a_duration(self):
+        for duration in (None, "", "abc", "1:-30", "1:2:3:4", "-5", "nan"):
+            self.assertIsNone(parse_duration(duration))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+import os
+import unittest
+
+from pyPodcastParser.EpisodeIndex import EpisodeIndex
+from pyPodcastParser.Podcast import Podcast
+
+
+class Test_Episode_Index(unittest.TestCase):
+
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        basic_podcast_path = os.path.join(test_feeds_dir, 'basic_podcast.rss')
+        with open(basic_podcast_path, "r") as f:
+            self.basic_podcast = f.read()
+        self.podcast = Podcast(self.basic_podcast, engine='stream')
+        self.index = EpisodeIndex()
+        self.index.add('basic', self.podcast)
+
+    def test_find_guid(self):
+        episodes = self.index.find_guid('basic item guid')
+        self.assertEqual(len(episodes), 1)
+        self.assertEqual(episodes[0].feed, 'basic')
+        self.assertIs(episodes[0].item, self.podcast.items[0])
+        self.assertEqual(self.index.find_guid('missing guid'), [])
+
+    def test_find_enclosure_url(self):
+        episodes = self.index.find_enclosure_url(
+            'https://github.com/jrigden/pyPodcastParser.mp3')
+        self.assertEqual([episode.item for episode in episodes],
+                         self.podcast.items)
+
+    def test_between(self):
+        first, second = self.podcast.items
+        self.assertLess(second.time_published, first.time_published)
+        self.assertEqual([episode.item for episode in self.index.between()],
+                         [second, first])
+        episodes = self.index.between(second.time_published,
+                                      first.time_published)
+        self.assertEqual([episode.item for episode in episodes], [second])
+        episodes = self.index.between(start=first.time_published)
+        self.assertEqual([episode.item for episode in episodes], [first])
+        self.assertEqual(self.index.between(end=second.time_published), [])
+
+    def test_many_feeds(self):
+        other = Podcast(self.basic_podcast.replace(
+            '>basic item guid<', '>other item guid<').replace(
+            '21 Mar 2008', '22 Mar 2008'), engine='stream')
+        self.index.add('other', other)
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.index.find_guid('other item guid')[0].feed,
+                         'other')
+        self.assertEqual(len(self.index.find_guid('another basic item guid')),
+                         2)
+        self.assertEqual(
+            [episode.feed for episode in self.index.between()],
+            ['basic', 'basic', 'other', 'other'])
+
+    def test_add_replaces_feed(self):
+        reparsed = Podcast(self.basic_podcast.replace(
+            'another basic item guid', 'new item guid'), engine='stream')
+        self.index.add('basic', reparsed)
+        self.assertEqual(len(self.index), 2)
+        self.assertEqual(self.index.find_guid('another basic item guid'), [])
+        self.assertIs(self.index.find_guid('new item guid')[0].item,
+                      reparsed.items[1])
+        self.assertEqual([episode.item for episode in self.index.between()],
+                         [reparsed.items[1], reparsed.items[0]])
+
+    def test_order_after_updates(self):
+        feeds = {}
+        for number in range(6):
+            day = 10 + number * 3 % 7
+            feeds[number] = self.basic_podcast.replace(
+                '21 Mar 2008', '%d Mar 2008' % day)
+            self.index.add(number, Podcast(feeds[number], engine='stream'))
+            if number % 2:
+                self.index.add(number - 1, Podcast(
+                    feeds[number - 1].replace('Mar 2008', 'Apr 2008'),
+                    engine='stream'))
+        self.index.remove(4)
+        self.index.add('basic', self.podcast)
+        episodes = self.index.between()
+        self.assertEqual(len(episodes), len(self.index))
+        self.assertEqual(len(self.index), 12)
+        times = [episode.item.time_published for episode in episodes]
+        self.assertEqual(times, sorted(times))
+        self.assertEqual(sorted(set(episode.feed for episode in episodes),
+                                key=str),
+                         [0, 1, 2, 3, 5, 'basic'])
+        self.assertEqual(self.index.by_time, sorted(self.index.by_time))
+        readded = [episode.item for episode in episodes
+                   if episode.feed in (0, 2)]
+        self.assertEqual(len(readded), 4)
+        for item in readded:
+            self.assertIn('Apr 2008', item.published_date)
+
+    def test_remove(self):
+        self.index.remove('basic')
+        self.assertNotIn('basic', self.index)
+        self.assertEqual(len(self.index), 0)
+        self.assertEqual(self.index.by_guid, {})
+        self.assertEqual(self.index.by_enclosure_url, {})
+        self.assertEqual(self.index.between(), [])
+        self.assertRaises(KeyError, self.index.remove, 'basic')
+
+    def test_items_without_fields(self):
+        podcast = Podcast(self.basic_podcast, engine='stream',
+                          fields=['title'], item_fields=['title'])
+        index = EpisodeIndex()
+        index.add('basic', podcast)
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.by_guid, {})
+        self.assertEqual(index.between(), [])
+        index.remove('basic')
+        self.assertEqual(len(index), 0)
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+
+from pyPodcastParser.FeedCache import FeedCache
+
+
+class Test_Feed_Cache(unittest.TestCase):
+
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        self.feeds = []
+        for name in sorted(os.listdir(test_feeds_dir)):
+            with open(os.path.join(test_feeds_dir, name), "r") as feed_file:
+                self.feeds.append(feed_file.read())
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_hit(self):
+        cache = FeedCache()
+        podcast = cache.parse(self.feeds[0])
+        self.assertTrue(cache.parse(self.feeds[0]) is podcast)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertIsNone(podcast.soup)
+
+    def test_options_are_part_of_the_key(self):
+        cache = FeedCache()
+        podcast = cache.parse(self.feeds[0])
+        self.assertFalse(cache.parse(self.feeds[0], engine='stream') is podcast)
+        self.assertEqual(cache.misses, 2)
+
+    def test_max_entries(self):
+        cache = FeedCache(max_entries=2)
+        for feed in self.feeds[:3]:
+            cache.parse(feed)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+        cache.parse(self.feeds[0])
+        self.assertEqual(cache.misses, 4)
+
+    def test_lru_order(self):
+        cache = FeedCache(max_entries=2)
+        cache.parse(self.feeds[0])
+        cache.parse(self.feeds[1])
+        cache.parse(self.feeds[0])
+        cache.parse(self.feeds[2])
+        cache.parse(self.feeds[0])
+        self.assertEqual(cache.hits, 2)
+
+    def test_max_bytes(self):
+        cache = FeedCache(max_bytes=1)
+        cache.parse(self.feeds[0])
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size, 0)
+
+    def test_disk_tier(self):
+        podcast = FeedCache(directory=self.directory).parse(self.feeds[1])
+        cache = FeedCache(directory=self.directory)
+        copy = cache.parse(self.feeds[1])
+        self.assertEqual(cache.stats()['disk_hits'], 1)
+        self.assertEqual(cache.misses, 0)
+        self.assertEqual(copy.to_dict(), podcast.to_dict())
+        cache.clear()
+        self.assertEqual(os.listdir(self.directory), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
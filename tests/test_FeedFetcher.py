@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+import gzip
+import os
+import threading
+import time
+import unittest
+import zlib
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+from pyPodcastParser.FeedFetcher import FeedFetcher, FetchError, decompress
+from pyPodcastParser.Limits import Limits
+
+ETAG = '"basic-1"'
+LAST_MODIFIED = 'Wed, 14 Oct 2015 07:00:00 GMT'
+
+
+class FeedServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            self.respond()
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def respond(self):
+        if self.path == '/redirect':
+            return self.send_body(301, b'', [('Location', '/feed')])
+        if self.path == '/loop':
+            return self.send_body(302, b'', [('Location', '/loop')])
+        if self.path == '/slow':
+            time.sleep(0.2)
+        elif self.path != '/feed':
+            return self.send_body(404, b'not found')
+        if self.headers.get('If-None-Match') == ETAG:
+            return self.send_body(304, b'')
+        body = self.server.feed
+        headers = [('ETag', ETAG), ('Last-Modified', LAST_MODIFIED)]
+        accepted = self.headers.get('Accept-Encoding', '')
+        if self.server.encoding == 'gzip' and 'gzip' in accepted:
+            body = gzip.compress(body)
+            headers.append(('Content-Encoding', 'gzip'))
+        elif self.server.encoding == 'deflate' and 'deflate' in accepted:
+            body = zlib.compress(body)
+            headers.append(('Content-Encoding', 'deflate'))
+        self.send_body(200, body, headers)
+
+    def send_body(self, status, body, headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Test_Feed_Fetcher(unittest.TestCase):
+
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        feed_path = os.path.join(test_dir, 'test_feeds', 'basic_podcast.rss')
+        with open(feed_path, "rb") as feed_file:
+            self.feed = feed_file.read()
+        self.server = FeedServer(('127.0.0.1', 0), FeedHandler)
+        self.server.feed = self.feed
+        self.server.encoding = None
+        self.server.lock = threading.Lock()
+        self.server.connections = 0
+        self.server.requests = 0
+        self.server.active = 0
+        self.server.max_active = 0
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        self.base_url = 'http://127.0.0.1:%d' % self.server.server_address[1]
+        self.fetcher = FeedFetcher(timeout=5)
+
+    def tearDown(self):
+        self.fetcher.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_fetch(self):
+        result = self.fetcher.fetch(self.base_url + '/feed')
+        self.assertEqual(result.status, 200)
+        self.assertEqual(result.etag, ETAG)
+        self.assertEqual(result.last_modified, LAST_MODIFIED)
+        self.assertEqual(result.podcast.title, "basic title")
+        self.assertEqual(len(result.podcast.items), 2)
+
+    def test_not_modified(self):
+        first = self.fetcher.fetch(self.base_url + '/feed')
+        second = self.fetcher.fetch(self.base_url + '/feed', etag=first.etag,
+                                    last_modified=first.last_modified)
+        self.assertEqual(second.status, 304)
+        self.assertIsNone(second.podcast)
+        self.assertEqual(second.etag, ETAG)
+        self.assertEqual(second.last_modified, LAST_MODIFIED)
+        third = self.fetcher.fetch(self.base_url + '/feed', etag=second.etag,
+                                   last_modified=second.last_modified)
+        self.assertEqual(third.status, 304)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_unread_body_is_not_drained(self):
+        self.server.feed = self.feed + b' ' * (1024 * 1024)
+        result = self.fetcher.fetch(self.base_url + '/feed',
+                                    limits=Limits(max_bytes=len(self.feed)))
+        self.assertEqual(result.podcast.limits_exceeded, ['max_bytes'])
+        self.assertEqual(len(result.podcast.items), 2)
+        self.assertEqual(sum(len(idle) for idle
+                             in self.fetcher.idle_connections.values()), 0)
+        self.fetcher.fetch(self.base_url + '/feed')
+        self.assertEqual(self.server.connections, 2)
+
+    def test_gzip(self):
+        self.server.encoding = 'gzip'
+        result = self.fetcher.fetch(self.base_url + '/feed')
+        self.assertEqual(result.podcast.title, "basic title")
+
+    def test_deflate(self):
+        self.server.encoding = 'deflate'
+        result = self.fetcher.fetch(self.base_url + '/feed')
+        self.assertEqual(result.podcast.title, "basic title")
+
+    def test_options(self):
+        result = self.fetcher.fetch(self.base_url + '/feed', lean=True)
+        self.assertIsNone(result.podcast.soup)
+        self.assertEqual(len(result.podcast.items), 2)
+
+    def test_connection_reuse(self):
+        for _ in range(3):
+            self.fetcher.fetch(self.base_url + '/feed')
+        self.assertEqual(self.server.requests, 3)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_redirect(self):
+        result = self.fetcher.fetch(self.base_url + '/redirect')
+        self.assertEqual(result.url, self.base_url + '/feed')
+        self.assertEqual(result.podcast.title, "basic title")
+
+    def test_too_many_redirects(self):
+        with self.assertRaises(FetchError):
+            self.fetcher.fetch(self.base_url + '/loop')
+
+    def test_error_status(self):
+        with self.assertRaises(FetchError) as context:
+            self.fetcher.fetch(self.base_url + '/missing')
+        self.assertEqual(context.exception.status, 404)
+
+    def test_max_per_host(self):
+        fetcher = FeedFetcher(max_per_host=1, timeout=5)
+        threads = [threading.Thread(target=fetcher.fetch,
+                                    args=(self.base_url + '/slow',))
+                   for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        fetcher.close()
+        self.assertEqual(self.server.requests, 3)
+        self.assertEqual(self.server.max_active, 1)
+
+    def test_decompress_raw_deflate(self):
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+        data = compressor.compress(self.feed) + compressor.flush()
+        chunks = [data[i:i + 100] for i in range(0, len(data), 100)]
+        self.assertEqual(b''.join(decompress(chunks, 'deflate')), self.feed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+from array import array
+import os
+import unittest
+
+from pyPodcastParser.ItemColumns import ItemColumns
+from pyPodcastParser.Podcast import Podcast
+
+
+class Test_Item_Columns(unittest.TestCase):
+
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        self.podcasts = []
+        for name in ('basic_podcast.rss', 'missing_info_podcast.rss'):
+            with open(os.path.join(test_feeds_dir, name), "r") as feed_file:
+                self.podcasts.append(Podcast(feed_file.read(),
+                                             engine='stream'))
+        self.columns = ItemColumns.from_podcasts(self.podcasts)
+
+    def test_rows(self):
+        items = [item for podcast in self.podcasts for item in podcast.items]
+        self.assertEqual(len(self.columns), len(items))
+        self.assertEqual(self.columns['guid'], [item.guid for item in items])
+        self.assertEqual(list(self.columns['podcast_index']),
+                         [0] * len(self.podcasts[0].items) +
+                         [1] * len(self.podcasts[1].items))
+
+    def test_numeric_columns(self):
+        items = [item for podcast in self.podcasts for item in podcast.items]
+        for field in ItemColumns.numeric_fields:
+            column = self.columns[field]
+            self.assertTrue(isinstance(column, array))
+            self.assertEqual(column.itemsize, 8)
+            values = [getattr(item, field) for item in items]
+            self.assertEqual(list(self.columns.valid[field]),
+                             [int(value is not None) for value in values])
+            self.assertEqual(list(column),
+                             [value or 0 for value in values])
+        self.assertEqual(self.columns['itunes_duration_seconds'][:2],
+                         array('q', [65, 4265]))
+
+    def test_fields(self):
+        columns = ItemColumns.from_podcasts(
+            self.podcasts, fields=('title', 'time_published'))
+        self.assertEqual(sorted(columns.columns),
+                         ['podcast_index', 'time_published', 'title'])
+        self.assertTrue('title' in columns)
+        self.assertRaises(ValueError, ItemColumns, ('title', 'nope'))
+
+    def test_lazy_items(self):
+        podcast = Podcast(self.podcasts[0].feed_content,
+                          lazy_items=True)
+        columns = ItemColumns.from_podcasts([podcast], fields=('guid',))
+        self.assertEqual(columns['guid'],
+                         [item.guid for item in self.podcasts[0].items])
+
+    def test_projected_podcast(self):
+        podcast = Podcast(self.podcasts[0].feed_content, engine='stream',
+                          fields=('title',),
+                          item_fields=('guid', 'time_published'))
+        columns = ItemColumns.from_podcasts([podcast, self.podcasts[0]])
+        items = self.podcasts[0].items
+        self.assertEqual(columns['guid'],
+                         [item.guid for item in items] * 2)
+        self.assertEqual(columns['author'],
+                         [None] * len(items) +
+                         [item.author for item in items])
+        self.assertEqual(list(columns['time_published'][:len(items)]),
+                         [item.time_published for item in items])
+        self.assertEqual(list(columns.valid['enclosure_length']),
+                         [0] * len(items) + [1] * len(items))
+
+
+if __name__ == '__main__':
+    unittest.main()
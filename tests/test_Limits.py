@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+import unittest
+
+from pyPodcastParser.Limits import Guard, LimitExceeded, Limits
+from pyPodcastParser.Podcast import Podcast
+from pyPodcastParser.StreamParser import StreamParser
+
+
+class Test_Limits(unittest.TestCase):
+
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        basic_podcast_path = os.path.join(test_feeds_dir, 'basic_podcast.rss')
+        with open(basic_podcast_path, "r") as f:
+            self.basic_podcast = f.read()
+        self.long_description = 'x' * 5000
+        self.long_podcast = self.basic_podcast.replace(
+            '<description>basic item description</description>',
+            '<description><![CDATA[%s]]></description>' %
+            self.long_description).replace(
+            '<itunes:summary>The Summary</itunes:summary>',
+            '<itunes:summary>%s</itunes:summary>' % self.long_description)
+
+    def parse(self, feed, **kwargs):
+        return Podcast(feed, engine='stream', **kwargs)
+
+    def test_within_limits(self):
+        expected = self.parse(self.basic_podcast)
+        podcast = self.parse(self.basic_podcast, limits=Limits(
+            max_bytes=len(self.basic_podcast), max_items=2,
+            max_text_length=1000, max_depth=10))
+        self.assertEqual(podcast.limits_exceeded, [])
+        self.assertEqual(podcast.to_dict(), expected.to_dict())
+        self.assertEqual(self.parse(self.basic_podcast).limits_exceeded, [])
+
+    def test_max_items(self):
+        podcast = self.parse(self.basic_podcast, limits=Limits(max_items=1))
+        self.assertEqual(podcast.limits_exceeded, ['max_items'])
+        self.assertEqual(len(podcast.items), 1)
+        self.assertEqual(podcast.items[0].guid, 'basic item guid')
+        self.assertEqual(podcast.title, 'basic title')
+
+    def test_truncate_text(self):
+        for backend in ('expat', 'html.parser'):
+            podcast = self.parse(self.long_podcast, backend=backend,
+                                 limits=Limits(max_text_length=100))
+            self.assertEqual(podcast.limits_exceeded, ['max_text_length'])
+            item = podcast.items[0]
+            self.assertEqual(item.description, self.long_description[:100])
+            self.assertEqual(item.itunes_summary, self.long_description[:100])
+            self.assertEqual(podcast.items[1].description,
+                             'another basic item description')
+
+    def test_drop_text(self):
+        for backend in ('expat', 'html.parser'):
+            podcast = self.parse(self.long_podcast, backend=backend,
+                                 limits=Limits(max_text_length=100,
+                                               text_overflow='drop'))
+            self.assertEqual(podcast.limits_exceeded, ['max_text_length'])
+            self.assertIsNone(podcast.items[0].description)
+            self.assertIsNone(podcast.items[0].itunes_summary)
+            self.assertEqual(podcast.items[0].guid, 'basic item guid')
+
+    def test_cdata_not_buffered(self):
+        guard = Guard(Limits(max_text_length=100))
+        parser = StreamParser(backend='html.parser', guard=guard)
+        parser.feed('<rss><channel><item><description><![CDATA[')
+        for _ in range(100):
+            parser.feed('x' * 1000)
+            self.assertLess(len(parser.backend.rawdata), 200)
+        parser.feed(']]></description><guid>g</guid></item></channel></rss>')
+        parser.close()
+        item = parser.items[0]
+        self.assertEqual(item.find('description').string, 'x' * 100)
+        self.assertEqual(item.find('guid').string, 'g')
+        self.assertEqual(guard.exceeded, ['max_text_length'])
+
+    def test_cdata_in_chunks(self):
+        feed = self.long_podcast.replace(
+            '<title>basic item title</title>',
+            '<title><![CDATA[short]]></title><!-- <![CDATA[ -->')
+        data = feed.encode('utf-8')
+        for text_overflow in ('truncate', 'drop'):
+            limits = Limits(max_text_length=100, text_overflow=text_overflow)
+            expected = self.parse(feed, backend='html.parser', limits=limits)
+            for chunk_size in (1, 7, 4096):
+                podcast = Podcast.from_stream(
+                    io.BytesIO(data), chunk_size=chunk_size, limits=limits)
+                self.assertEqual(podcast.to_dict(), expected.to_dict())
+                self.assertEqual(podcast.items[0].title, 'short')
+                self.assertEqual(podcast.items[0].guid, 'basic item guid')
+                self.assertEqual(podcast.limits_exceeded, ['max_text_length'])
+
+    def test_max_bytes(self):
+        cut = self.basic_podcast.index('another basic item guid')
+        podcast = self.parse(self.basic_podcast,
+                             limits=Limits(max_bytes=cut))
+        self.assertEqual(podcast.limits_exceeded, ['max_bytes'])
+        self.assertEqual(podcast.title, 'basic title')
+        self.assertEqual(podcast.items[0].guid, 'basic item guid')
+        self.assertIsNone(podcast.items[1].guid)
+
+    def test_max_bytes_chunked(self):
+        data = self.basic_podcast.encode('utf-8')
+        cut = data.index(b'another basic item guid')
+        podcast = Podcast.from_stream(io.BytesIO(data), chunk_size=100,
+                                      limits=Limits(max_bytes=cut))
+        self.assertEqual(podcast.limits_exceeded, ['max_bytes'])
+        self.assertEqual(podcast.items[0].guid, 'basic item guid')
+        self.assertEqual(len(podcast.items), 2)
+
+    def test_max_depth(self):
+        feed = self.basic_podcast.replace(
+            '<title>basic item title</title>',
+            '<title>basic item title</title><a><b><c>deep</c></b></a>')
+        podcast = self.parse(feed, limits=Limits(max_depth=4))
+        self.assertEqual(podcast.limits_exceeded, ['max_depth'])
+        self.assertEqual(podcast.items[0].title, 'basic item title')
+        self.assertEqual(podcast.items[0].guid, 'basic item guid')
+        self.assertEqual(len(podcast.items), 2)
+
+    def test_max_depth_unclosed_tags(self):
+        feed = self.basic_podcast.replace(
+            '<description>basic item description</description>',
+            '<description><p>a<br>b</p></description><title>one</title>')
+        podcast = self.parse(feed, backend='html.parser',
+                             limits=Limits(max_depth=4))
+        self.assertEqual(podcast.limits_exceeded, ['max_depth'])
+        item = podcast.items[0]
+        self.assertEqual(item.title, 'one')
+        self.assertEqual(item.guid, 'basic item guid')
+        self.assertEqual(item.itunes_summary, 'The Summary')
+        self.assertEqual(len(podcast.items), 2)
+
+    def test_strict(self):
+        limits = Limits(max_items=1, strict=True)
+        with self.assertRaises(LimitExceeded) as context:
+            self.parse(self.basic_podcast, limits=limits)
+        self.assertEqual(context.exception.limit, 'max_items')
+        self.assertRaises(LimitExceeded, self.parse, self.long_podcast,
+                          limits=Limits(max_text_length=100, strict=True))
+        self.assertRaises(LimitExceeded, self.parse, self.basic_podcast,
+                          limits=Limits(max_bytes=100, strict=True))
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, Limits, text_overflow='nope')
+        self.assertRaises(ValueError, Podcast, self.basic_podcast,
+                          limits=Limits(max_items=1))
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+
+from pyPodcastParser.Limits import Limits
+from pyPodcastParser.Podcast import Podcast
+from pyPodcastParser.Snapshot import Snapshot, SnapshotError
+
+
+class Test_Snapshot(unittest.TestCase):
+
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        self.podcasts = []
+        for name in sorted(os.listdir(test_feeds_dir)):
+            with open(os.path.join(test_feeds_dir, name), "r") as feed_file:
+                self.podcasts.append(Podcast(feed_file.read(),
+                                             engine='stream',
+                                             fingerprints=True))
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def assertSameItem(self, item, expected):
+        for field in item.serialized_fields + ('fingerprint',):
+            self.assertEqual(getattr(item, field), getattr(expected, field))
+
+    def assertSamePodcast(self, podcast, expected):
+        self.assertEqual(podcast.to_dict(), expected.to_dict())
+        for field in expected.derived_fields + ('fingerprint',):
+            self.assertEqual(getattr(podcast, field),
+                             getattr(expected, field))
+        for item, expected_item in zip(podcast.items, expected.items):
+            self.assertSameItem(item, expected_item)
+
+    def test_round_trip(self):
+        for expected in self.podcasts:
+            podcast = Snapshot.loads(Snapshot.dumps(expected))
+            self.assertSamePodcast(podcast, expected)
+            self.assertIsNone(podcast.feed_content)
+            self.assertIsNone(podcast.soup)
+
+    def test_aware_datetime(self):
+        expected = self.podcasts[0].items[0].published_datetime
+        item = Snapshot.loads(Snapshot.dumps(self.podcasts[0])).items[0]
+        self.assertEqual(item.published_datetime.utcoffset(),
+                         expected.utcoffset())
+
+    def test_strings_are_interned(self):
+        podcast = self.podcasts[0]
+        snapshot = Snapshot(Snapshot.dumps(podcast))
+        self.assertEqual(snapshot.item(0).enclosure_url,
+                         snapshot.item(1).enclosure_url)
+        self.assertEqual(snapshot.strings.count(
+            podcast.items[0].enclosure_url), 1)
+
+    def test_save_and_load(self):
+        path = os.path.join(self.directory, 'basic.snapshot')
+        Snapshot.save(self.podcasts[0], path)
+        self.assertSamePodcast(Snapshot.load(path), self.podcasts[0])
+
+    def test_mmap_single_item(self):
+        path = os.path.join(self.directory, 'basic.snapshot')
+        Snapshot.save(self.podcasts[0], path)
+        with Snapshot.open(path) as snapshot:
+            self.assertEqual(len(snapshot), 2)
+            self.assertSameItem(snapshot.item(-1), self.podcasts[0].items[1])
+            self.assertTrue(None in snapshot.strings)
+            self.assertRaises(IndexError, snapshot.item, 2)
+
+    def test_projection(self):
+        with open(os.path.join(os.path.dirname(__file__), 'test_feeds',
+                               'basic_podcast.rss'), "r") as feed_file:
+            expected = Podcast(feed_file.read(), fields=('title',),
+                               item_fields=('guid', 'date_time'))
+        podcast = Snapshot.loads(Snapshot.dumps(expected))
+        self.assertEqual(podcast.to_dict(), expected.to_dict())
+        self.assertRaises(AttributeError, getattr, podcast, 'link')
+        self.assertRaises(AttributeError, getattr, podcast.items[0], 'title')
+
+    def test_limits_exceeded(self):
+        with open(os.path.join(os.path.dirname(__file__), 'test_feeds',
+                               'basic_podcast.rss'), "r") as feed_file:
+            expected = Podcast(feed_file.read(), engine='stream',
+                               limits=Limits(max_items=1))
+        podcast = Snapshot.loads(Snapshot.dumps(expected))
+        self.assertEqual(podcast.limits_exceeded, ['max_items'])
+        self.assertEqual(len(podcast.items), 1)
+        podcast = Snapshot.loads(Snapshot.dumps(self.podcasts[0]))
+        self.assertEqual(podcast.limits_exceeded, [])
+
+    def test_big_int(self):
+        podcast = self.podcasts[0]
+        podcast.items[0].enclosure_length = 2 ** 70
+        podcast = Snapshot.loads(Snapshot.dumps(podcast))
+        self.assertEqual(podcast.items[0].enclosure_length, 2 ** 70)
+
+    def test_bad_snapshots(self):
+        data = Snapshot.dumps(self.podcasts[0])
+        self.assertRaises(SnapshotError, Snapshot, b'nope')
+        self.assertRaises(SnapshotError, Snapshot, b'X' + data[1:])
+        self.assertRaises(SnapshotError, Snapshot,
+                          data[:4] + b'\x63\x00' + data[6:])
+        self.assertRaises(SnapshotError, Snapshot, data[:len(data) // 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
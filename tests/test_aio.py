@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import os
+import unittest
+
+from pyPodcastParser import Podcast
+from pyPodcastParser.Limits import Limits
+from pyPodcastParser.aio import AsyncParser, parse, parse_stream
+
+
+class Test_Async_Parser(unittest.TestCase):
+
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        basic_podcast_path = os.path.join(test_feeds_dir, 'basic_podcast.rss')
+        with open(basic_podcast_path, "rb") as basic_podcast_file:
+            self.basic_podcast = basic_podcast_file.read()
+        self.expected = Podcast.Podcast(
+            self.basic_podcast, engine='stream').to_dict()
+
+    async def chunks(self, size=50, delay=0):
+        for start in range(0, len(self.basic_podcast), size):
+            await asyncio.sleep(delay)
+            yield self.basic_podcast[start:start + size]
+
+    def test_parse(self):
+        podcast = asyncio.run(parse(self.basic_podcast, engine='stream'))
+        self.assertEqual(podcast.to_dict(), self.expected)
+
+    def test_parse_in_process_pool(self):
+        async def run():
+            with ProcessPoolExecutor(1) as executor:
+                return await parse(self.basic_podcast, executor, engine='stream')
+        podcast = asyncio.run(run())
+        self.assertTrue(podcast.lean)
+        self.assertEqual(podcast.to_dict(), self.expected)
+
+    def test_parse_stream(self):
+        podcast = asyncio.run(parse_stream(self.chunks()))
+        self.assertEqual(podcast.to_dict(), self.expected)
+
+    def test_parse_stream_holds_no_thread(self):
+        async def run():
+            with ThreadPoolExecutor(2) as executor:
+                parser = AsyncParser(executor)
+                streams = [asyncio.ensure_future(
+                    parser.parse_stream(self.chunks(delay=0.01)))
+                    for _ in range(4)]
+                await asyncio.sleep(0.02)
+                podcast = await parser.parse(self.basic_podcast,
+                                             engine='stream')
+                self.assertFalse(any(stream.done() for stream in streams))
+                return [podcast] + await asyncio.gather(*streams)
+        for podcast in asyncio.run(run()):
+            self.assertEqual(podcast.to_dict(), self.expected)
+
+    def test_parse_stream_max_bytes(self):
+        received = []
+
+        async def chunks():
+            async for chunk in self.chunks():
+                received.append(chunk)
+                yield chunk
+        limits = Limits(max_bytes=120)
+        podcast = asyncio.run(parse_stream(chunks(), limits=limits))
+        self.assertEqual(podcast.limits_exceeded, ['max_bytes'])
+        self.assertEqual(len(received), 3)
+
+    def test_parse_stream_with_process_pool(self):
+        async def run():
+            with ProcessPoolExecutor(1) as executor:
+                return await parse_stream(self.chunks(), executor)
+        podcast = asyncio.run(run())
+        self.assertEqual(podcast.to_dict(), self.expected)
+
+    def test_max_concurrency(self):
+        parser = AsyncParser(max_concurrency=2)
+
+        async def run():
+            semaphore = parser.get_semaphore()
+            tasks = [asyncio.ensure_future(parser.parse(self.basic_podcast))
+                     for _ in range(5)]
+            await asyncio.sleep(0)
+            self.assertTrue(semaphore.locked())
+            return await asyncio.gather(*tasks)
+        self.assertEqual(len(asyncio.run(run())), 5)
+
+    def test_cancel_parse_stream(self):
+        parser = AsyncParser(max_concurrency=1)
+
+        async def run():
+            task = asyncio.ensure_future(
+                parser.parse_stream(self.chunks(delay=0.01)))
+            await asyncio.sleep(0.03)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            self.assertFalse(parser.get_semaphore().locked())
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import os
+import pickle
+import unittest
+
+from pyPodcastParser import Podcast
+from pyPodcastParser.batch import parse_many
+
+
+class KilledWorker(object):
+    """Feed content that kills the process parsing it"""
+
+    def __iter__(self):
+        os._exit(1)
+
+
+class Test_Parse_Many(unittest.TestCase):
+
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        self.feeds = []
+        for name in sorted(os.listdir(test_feeds_dir)):
+            with open(os.path.join(test_feeds_dir, name), "r") as feed_file:
+                self.feeds.append(feed_file.read())
+
+    def check_results(self, results):
+        results = sorted(results)
+        self.assertEqual([result.index for result in results],
+                         list(range(len(self.feeds) + 1)))
+        for result, feed in zip(results, self.feeds):
+            self.assertIsNone(result.error)
+            expected = Podcast.Podcast(feed, engine='stream').to_dict()
+            self.assertEqual(result.podcast.to_dict(), expected)
+            self.assertIsNone(result.podcast.soup)
+        self.assertIsNone(results[-1].podcast)
+        self.assertTrue(results[-1].error.startswith("TypeError"))
+
+    def test_pool(self):
+        self.check_results(
+            parse_many(self.feeds + [None], workers=2, engine='stream'))
+
+    def test_in_process(self):
+        self.check_results(
+            parse_many(self.feeds + [None], workers=1, engine='stream'))
+
+    def test_killed_worker(self):
+        contents = self.feeds + [KilledWorker()] + self.feeds
+        killed = len(self.feeds)
+        results = sorted(parse_many(contents, workers=2, engine='stream'))
+        self.assertEqual([result.index for result in results],
+                         list(range(len(contents))))
+        self.assertTrue(results[killed].error.startswith("BrokenProcessPool"))
+        for result in results:
+            if result.error is None:
+                self.assertEqual(
+                    result.podcast.to_dict(),
+                    Podcast.Podcast(contents[result.index],
+                                    engine='stream').to_dict())
+            else:
+                self.assertTrue(result.error.startswith("BrokenProcessPool"))
+        self.assertTrue(any(result.error is None
+                            for result in results[killed + 1:]))
+
+    def test_unpicklable_content(self):
+        contents = [self.feeds[0], (chunk for chunk in [self.feeds[1]]),
+                    self.feeds[2]]
+        results = sorted(parse_many(contents, workers=2, engine='stream'))
+        self.assertEqual([result.index for result in results], [0, 1, 2])
+        self.assertIsNone(results[1].podcast)
+        self.assertIn("pickle", results[1].error)
+        for index in (0, 2):
+            self.assertIsNone(results[index].error)
+            self.assertEqual(
+                results[index].podcast.to_dict(),
+                Podcast.Podcast(contents[index], engine='stream').to_dict())
+
+    def test_lean_podcast_pickles(self):
+        podcast = Podcast.Podcast(self.feeds[0], lean=True)
+        copy = pickle.loads(pickle.dumps(podcast, pickle.HIGHEST_PROTOCOL))
+        self.assertEqual(copy.to_dict(), podcast.to_dict())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,15 @@
 # -*- coding: utf-8 -*-
 import datetime
+import io
+import json
 import os
 import unittest
 
+from pyPodcastParser import Item
+from pyPodcastParser import Limits
 from pyPodcastParser import Podcast
+from pyPodcastParser import StreamParser
+from pyPodcastParser import serialize
 
 # py.test test_pyPodcastParser.py
 
@@ -125,6 +131,10 @@ class Test_Basic_Feed_Items(unittest.TestCase):
         self.assertEqual(self.podcast.items[0].itunes_duration, "1:05")
         self.assertEqual(self.podcast.items[1].itunes_duration, "1:11:05")
 
+    def test_item_itunes_duration_seconds(self):
+        self.assertEqual(self.podcast.items[0].itunes_duration_seconds, 65)
+        self.assertEqual(self.podcast.items[1].itunes_duration_seconds, 4265)
+
     def test_item_itunes_closed_captioned(self):
         self.assertEqual(self.podcast.items[0].itunes_closed_captioned, "yes")
         self.assertEqual(self.podcast.items[1].itunes_closed_captioned, None)
@@ -169,6 +179,11 @@ class Test_Basic_Feed_Items(unittest.TestCase):
     def test_item_published_date(self):
         self.assertTrue(isinstance(self.podcast.items[1].date_time, datetime.datetime))
 
+    def test_item_published_datetime(self):
+        published = self.podcast.items[1].published_datetime
+        self.assertEqual(published.utcoffset(), datetime.timedelta(hours=-4))
+        self.assertEqual(published.timestamp(),
+                         self.podcast.items[1].time_published)
 
     def test_item_title(self):
         self.assertEqual(self.podcast.items[0].title, "basic item title")
@@ -514,5 +529,616 @@ class Test_Itunes_Block_Feed(unittest.TestCase):
     def test_itunes_explicit(self):
         self.assertEqual(self.podcast.itunes_explicit, "yes")
 
+class Test_Item_Tag_Dispatch(unittest.TestCase):
+
+    def setUp(self):
+        self.feed = ('<rss><channel><item>'
+                     '<title>first</title><category>a</category>'
+                     '<title>second</title><category>b</category>'
+                     '<enclosure url="http://x/1.mp3" length="x"/>'
+                     '</item></channel></rss>')
+
+    def check_item(self, item):
+        self.assertEqual(item.title, "first")
+        self.assertEqual(item.categories, ["a", "b"])
+        self.assertEqual(item.enclosure_url, "http://x/1.mp3")
+        self.assertEqual(item.enclosure_type, None)
+        self.assertEqual(item.enclosure_length, None)
+        self.assertEqual(item.time_published, None)
+
+    def test_soup_engine(self):
+        self.check_item(Podcast.Podcast(self.feed).items[0])
+
+    def test_stream_engine(self):
+        self.check_item(Podcast.Podcast(self.feed, engine='stream').items[0])
+
+
+class Test_Compact_Records(unittest.TestCase):
+
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        basic_podcast_path = os.path.join(test_feeds_dir, 'basic_podcast.rss')
+        basic_podcast_file = open(basic_podcast_path, "r")
+        self.basic_podcast = basic_podcast_file.read()
+        self.podcast = Podcast.Podcast(self.basic_podcast)
+
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(self.podcast, '__dict__'))
+        self.assertFalse(hasattr(self.podcast.items[0], '__dict__'))
+
+    def test_item_drops_soup(self):
+        self.assertIsNone(self.podcast.items[0].soup)
+
+    def test_item_strings_are_plain(self):
+        self.assertTrue(type(self.podcast.items[0].title) is type(u''))
+
+
+class Test_Soup_Is_Not_Mutated(unittest.TestCase):
+
+    def setUp(self):
+        self.feed = ('<rss><channel><title>channel</title>'
+                     '<image><title>image</title><url>http://i</url></image>'
+                     '<item><title>item</title><image><url>http://x</url>'
+                     '</image></item></channel></rss>')
+        self.podcast = Podcast.Podcast(self.feed)
+
+    def test_full_soup_keeps_items_and_images(self):
+        self.assertEqual(len(self.podcast.full_soup.findAll('item')), 1)
+        self.assertEqual(len(self.podcast.full_soup.findAll('image')), 2)
+
+    def test_scopes(self):
+        self.assertEqual(self.podcast.title, "channel")
+        self.assertEqual(self.podcast.items[0].title, "item")
+        self.assertEqual(self.podcast.count_items(), (0, 1))
+
+    def test_phases_can_run_in_any_order(self):
+        self.podcast.set_image()
+        self.podcast.set_items()
+        self.podcast.set_required_elements()
+        self.podcast.set_image()
+        self.assertEqual(self.podcast.title, "channel")
+        self.assertEqual(self.podcast.items[0].title, "item")
+
+
+class Test_Lean_Mode(unittest.TestCase):
+
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        basic_podcast_path = os.path.join(test_feeds_dir, 'basic_podcast.rss')
+        basic_podcast_file = open(basic_podcast_path, "r")
+        self.basic_podcast = basic_podcast_file.read()
+        self.podcast = Podcast.Podcast(self.basic_podcast, lean=True)
+
+    def test_releases_soups(self):
+        self.assertIsNone(self.podcast.feed_content)
+        self.assertIsNone(self.podcast.soup)
+        self.assertIsNone(self.podcast.full_soup)
+
+    def test_attributes_kept(self):
+        self.assertEqual(self.podcast.copyright, "basic copyright")
+        self.assertEqual(self.podcast.items[0].guid, 'basic item guid')
+
+    def test_memory_footprint(self):
+        podcast = Podcast.Podcast(self.basic_podcast)
+        self.assertTrue(
+            self.podcast.memory_footprint() < podcast.memory_footprint())
+
+
+class Stream_Engine_Mixin(object):
+    """Re-runs a feed test case with the stream engine"""
+
+    def setUp(self):
+        super(Stream_Engine_Mixin, self).setUp()
+        self.podcast = Podcast.Podcast(self.basic_podcast, engine='stream')
+
+
+class Test_Stream_Basic_Feed(Stream_Engine_Mixin, Test_Basic_Feed):
+    pass
+
+
+class Test_Stream_Basic_Feed_Items(Stream_Engine_Mixin, Test_Basic_Feed_Items):
+    pass
+
+
+class Test_Stream_Unicode_Feed(Stream_Engine_Mixin, Test_Unicode_Feed):
+    pass
+
+
+class Test_Stream_Missing_Info_Feed(Stream_Engine_Mixin, Test_Missing_Info_Feed):
+    pass
+
+
+class Test_Stream_Itunes_Block_Feed(Stream_Engine_Mixin, Test_Itunes_Block_Feed):
+    pass
+
+
+class Test_Stream_Engine(unittest.TestCase):
+
+    def test_unknown_engine(self):
+        self.assertRaises(ValueError, Podcast.Podcast, "<rss/>", engine='x')
+
+    def test_bytes_with_encoding_declaration(self):
+        feed = (u'<?xml version="1.0" encoding="iso-8859-1"?>'
+                u'<rss><channel><title>caf\xe9</title></channel></rss>')
+        podcast = Podcast.Podcast(feed.encode('iso-8859-1'), engine='stream')
+        self.assertEqual(podcast.title, u"caf\xe9")
+
+    def test_cdata_description(self):
+        feed = ('<rss><channel><item><description><![CDATA[<p>x</p>]]>'
+                '</description></item></channel></rss>')
+        podcast = Podcast.Podcast(feed, engine='stream')
+        self.assertEqual(podcast.items[0].description, "<p>x</p>")
+
+    def test_mixed_content_has_no_string(self):
+        feed = ('<rss><channel><item><description>a <b>b</b>'
+                '</description></item></channel></rss>')
+        podcast = Podcast.Podcast(feed, engine='stream')
+        self.assertEqual(podcast.items[0].description, None)
+
+
+class Test_Backend_Conformance(unittest.TestCase):
+
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        self.feeds = []
+        for name in sorted(os.listdir(test_feeds_dir)):
+            with open(os.path.join(test_feeds_dir, name), "r") as feed_file:
+                self.feeds.append(feed_file.read())
+        self.feeds.append(
+            '<rss><channel><title>\n<![CDATA[a]]>\n</title><item>'
+            '<description><![CDATA[<p>b</p>]]></description>'
+            '<!-- note --><comments><!--c--></comments></item></channel></rss>')
+
+    def fields(self, podcast):
+        values = [getattr(podcast, field) for field in podcast.fields]
+        for item in podcast.items:
+            values.append([getattr(item, field) for field in item.fields])
+        return values
+
+    def test_identical_output(self):
+        for feed in self.feeds:
+            expected = Podcast.Podcast(
+                feed, engine='stream', backend='html.parser')
+            for backend in StreamParser.BACKENDS:
+                podcast = Podcast.Podcast(feed, engine='stream', backend=backend)
+                self.assertEqual(podcast.to_dict(), expected.to_dict())
+                self.assertEqual(self.fields(podcast), self.fields(expected))
+
+    def test_auto_falls_back_to_html_parser(self):
+        feed = ('<rss><channel><title>a&nbsp;b</title><item><guid>1</guid>'
+                '</channel></rss>')
+        self.assertRaises(StreamParser.XML_ERRORS, Podcast.Podcast,
+                          feed, engine='stream', backend='expat')
+        podcast = Podcast.Podcast(feed, engine='stream')
+        self.assertEqual(podcast.title, u"a\xa0b")
+        self.assertEqual(podcast.items[0].guid, "1")
+
+    def test_auto_choice(self):
+        self.assertEqual(StreamParser.choose_backend([u"<rss/>"]), 'expat')
+        self.assertEqual(
+            StreamParser.choose_backend([u"<rss>\r\n</rss>"]), 'html.parser')
+        self.assertEqual(
+            StreamParser.choose_backend(iter([u"<rss/>"])), 'html.parser')
+
+    def test_new_items_after_fallback(self):
+        feed = ('<rss><channel><item><guid>new</guid></item>&nbsp;'
+                '<item><guid>old</guid></item></channel></rss>')
+        items = Podcast.Podcast.new_items(feed, known_guids={'old'})
+        self.assertEqual([item.guid for item in items], ['new'])
+
+    def test_unknown_backend(self):
+        self.assertRaises(ValueError, Podcast.Podcast, "<rss/>",
+                          engine='stream', backend='x')
+
+
+class Test_Namespace_Prefixes(unittest.TestCase):
+
+    def setUp(self):
+        self.feed = (
+            '<rss xmlns:it="http://www.itunes.com/dtds/podcast-1.0.dtd" '
+            'xmlns:a="http://www.w3.org/2005/Atom">'
+            '<channel><it:author>channel author</it:author>'
+            '<it:owner><it:name>owner</it:name></it:owner>'
+            '<a:link rel="hub" href="https://hub.example.com"/>'
+            '<item><it:duration>1:05</it:duration></item>'
+            '<item xmlns:x="http://www.itunes.com/dtds/podcast-1.0.dtd">'
+            '<x:duration>2:05</x:duration><it:summary>s</it:summary></item>'
+            '<item><x:duration>3:05</x:duration></item>'
+            '</channel></rss>')
+
+    def test_channel_prefix(self):
+        for backend in StreamParser.BACKENDS:
+            podcast = Podcast.Podcast(self.feed, engine='stream', backend=backend)
+            self.assertEqual(podcast.itunes_author_name, "channel author")
+            self.assertEqual(podcast.owner_name, "owner")
+            self.assertEqual(podcast.pubsubhubbub, "https://hub.example.com")
+
+    def test_item_prefix(self):
+        podcast = Podcast.Podcast(self.feed, engine='stream')
+        self.assertEqual(podcast.items[0].itunes_duration, "1:05")
+        self.assertEqual(podcast.items[1].itunes_duration, "2:05")
+        self.assertEqual(podcast.items[1].itunes_summary, "s")
+
+    def test_binding_is_scoped(self):
+        podcast = Podcast.Podcast(self.feed, engine='stream',
+                                  backend='html.parser')
+        self.assertEqual(podcast.items[2].itunes_duration, None)
+
+    def test_unbound_prefix_kept(self):
+        feed = ('<rss><channel><itunes:author>a</itunes:author>'
+                '</channel></rss>')
+        podcast = Podcast.Podcast(feed, engine='stream')
+        self.assertEqual(podcast.itunes_author_name, "a")
+
+
+class Test_Lazy_Basic_Feed_Items(Test_Basic_Feed_Items):
+
+    def setUp(self):
+        super(Test_Lazy_Basic_Feed_Items, self).setUp()
+        self.podcast = Podcast.Podcast(
+            self.basic_podcast, engine='stream', lazy_items=True)
+
+    def test_items_parsed_on_access(self):
+        podcast = Podcast.Podcast(self.basic_podcast, lazy_items=True)
+        self.assertEqual(podcast.items.count_parsed(), 0)
+        self.assertEqual(podcast.items[1].guid, 'another basic item guid')
+        self.assertEqual(podcast.items.count_parsed(), 1)
+        self.assertTrue(podcast.items[1] is podcast.items[1])
+
+    def test_validity_parses_no_items(self):
+        self.assertTrue(self.podcast.is_valid_podcast)
+        self.assertEqual(self.podcast.items.count_parsed(), 0)
+        video = Podcast.Podcast(
+            self.basic_podcast.replace('audio/mpeg', 'video/mp4'),
+            engine='stream', lazy_items=True)
+        self.assertFalse(video.is_valid_podcast)
+        self.assertEqual(video.items.count_parsed(), 0)
+        self.assertEqual(video.items[0].enclosure_type, 'video/mp4')
+
+    def test_lazy_dates(self):
+        item = self.podcast.items[0]
+        self.assertRaises(AttributeError, object.__getattribute__,
+                          item, 'date_time')
+        self.assertTrue(isinstance(item.date_time, datetime.datetime))
+
+    def test_slice(self):
+        self.assertEqual([item.guid for item in self.podcast.items[:1]],
+                         ['basic item guid'])
+
+
+class Test_New_Items(unittest.TestCase):
+
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        basic_podcast_path = os.path.join(test_feeds_dir, 'basic_podcast.rss')
+        basic_podcast_file = open(basic_podcast_path, "r")
+        self.basic_podcast = basic_podcast_file.read()
+        self.podcast = Podcast.Podcast(self.basic_podcast)
+
+    def test_nothing_known(self):
+        items = Podcast.Podcast.new_items(self.basic_podcast)
+        self.assertEqual(len(items), 2)
+
+    def test_known_guid(self):
+        items = Podcast.Podcast.new_items(
+            self.basic_podcast, known_guids={'another basic item guid'})
+        self.assertEqual([item.guid for item in items], ['basic item guid'])
+
+    def test_newest_known(self):
+        items = Podcast.Podcast.new_items(
+            self.basic_podcast, known_guids={'basic item guid'})
+        self.assertEqual(items, [])
+
+    def test_since(self):
+        since = self.podcast.items[1].time_published
+        items = Podcast.Podcast.new_items(self.basic_podcast, since=since)
+        self.assertEqual([item.guid for item in items], ['basic item guid'])
+
+    def test_stops_at_known_item(self):
+        feed = ('<rss><channel><item><guid>new</guid></item>'
+                '<item><guid>old</guid></item><item><guid>older')
+        items = Podcast.Podcast.new_items(feed, known_guids={'old'})
+        self.assertEqual([item.guid for item in items], ['new'])
+
+
+class Test_Chunked_Input(unittest.TestCase):
+
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        self.unicode_podcast_path = os.path.join(
+            test_feeds_dir, 'unicode_podcast.rss')
+        with open(self.unicode_podcast_path, "rb") as unicode_podcast_file:
+            self.unicode_podcast = unicode_podcast_file.read()
+        self.expected = Podcast.Podcast(
+            self.unicode_podcast, engine='stream').to_dict()
+
+    def test_from_bytes(self):
+        podcast = Podcast.Podcast.from_bytes(self.unicode_podcast, chunk_size=7)
+        self.assertEqual(podcast.to_dict(), self.expected)
+        self.assertIsNone(podcast.feed_content)
+
+    def test_from_file(self):
+        podcast = Podcast.Podcast.from_file(self.unicode_podcast_path)
+        self.assertEqual(podcast.to_dict(), self.expected)
+
+    def test_from_file_mmap(self):
+        podcast = Podcast.Podcast.from_file(
+            self.unicode_podcast_path, chunk_size=100, use_mmap=True)
+        self.assertEqual(podcast.to_dict(), self.expected)
+
+    def test_podcast_parser(self):
+        parser = Podcast.PodcastParser()
+        for start in range(0, len(self.unicode_podcast), 7):
+            parser.feed(self.unicode_podcast[start:start + 7])
+        podcast = parser.close()
+        self.assertEqual(podcast.to_dict(), self.expected)
+        self.assertEqual(podcast.engine, 'stream')
+
+    def test_podcast_parser_options(self):
+        parser = Podcast.PodcastParser(
+            fields=('title',), item_fields=('guid',), lean=True)
+        parser.feed(self.unicode_podcast)
+        podcast = parser.close()
+        self.assertTrue(podcast.lean)
+        self.assertEqual(podcast.to_dict(),
+                         Podcast.Podcast(self.unicode_podcast, engine='stream',
+                                         fields=('title',),
+                                         item_fields=('guid',)).to_dict())
+        self.assertRaises(ValueError, Podcast.PodcastParser, fields=('x',))
+
+    def test_from_file_mmap_error(self):
+        limits = Limits.Limits(max_text_length=10, strict=True)
+        self.assertRaises(Limits.LimitExceeded, Podcast.Podcast.from_file,
+                          self.unicode_podcast_path, chunk_size=100,
+                          use_mmap=True, limits=limits)
+
+    def test_from_text_stream(self):
+        stream = io.StringIO(self.unicode_podcast.decode('utf-8'))
+        podcast = Podcast.Podcast.from_stream(stream, chunk_size=10)
+        self.assertEqual(podcast.to_dict(), self.expected)
+
+    def test_declared_encoding(self):
+        feed = (u'<?xml version="1.0" encoding="iso-8859-1"?>'
+                u'<rss><channel><title>caf\xe9</title></channel></rss>')
+        stream = io.BytesIO(feed.encode('iso-8859-1'))
+        podcast = Podcast.Podcast.from_stream(stream, chunk_size=3)
+        self.assertEqual(podcast.title, u"caf\xe9")
+
+    def test_chunks_need_stream_engine(self):
+        self.assertRaises(ValueError, Podcast.Podcast, iter([b"<rss/>"]))
+
+
+class Test_Fingerprints(unittest.TestCase):
+
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        basic_podcast_path = os.path.join(
+            test_dir, 'test_feeds', 'basic_podcast.rss')
+        with open(basic_podcast_path, "r") as basic_podcast_file:
+            self.basic_podcast = basic_podcast_file.read()
+        self.podcast = Podcast.Podcast(self.basic_podcast, fingerprints=True)
+
+    def test_off_by_default(self):
+        podcast = Podcast.Podcast(self.basic_podcast)
+        self.assertIsNone(podcast.fingerprint)
+        self.assertIsNone(podcast.items[0].fingerprint)
+
+    def test_fingerprints(self):
+        self.assertEqual(len(self.podcast.fingerprint), 32)
+        item_fingerprints = set(item.fingerprint
+                                for item in self.podcast.items)
+        self.assertEqual(len(item_fingerprints), 2)
+
+    def test_same_across_backends(self):
+        expat = Podcast.Podcast(self.basic_podcast, engine='stream',
+                                backend='expat', fingerprints=True)
+        podcast = Podcast.Podcast(self.basic_podcast, engine='stream',
+                                  backend='html.parser', lazy_items=True,
+                                  fingerprints=True)
+        self.assertEqual(podcast.fingerprint, expat.fingerprint)
+        self.assertEqual([item.fingerprint for item in podcast.items],
+                         [item.fingerprint for item in expat.items])
+
+    def test_volatile_fields_are_excluded(self):
+        rebuilt = self.basic_podcast.replace(
+            "<lastBuildDate>Mon, 24 Mar 2008 23:30:07 GMT",
+            "<lastBuildDate>Tue, 25 Mar 2008 10:00:00 GMT")
+        podcast = Podcast.Podcast(rebuilt, fingerprints=True)
+        self.assertEqual(podcast.fingerprint, self.podcast.fingerprint)
+        podcast = Podcast.Podcast(rebuilt, fingerprints=True,
+                                  fingerprint_exclude=())
+        self.assertNotEqual(podcast.fingerprint, self.podcast.fingerprint)
+
+    def test_item_change(self):
+        edited = self.basic_podcast.replace("basic item title",
+                                            "edited item title", 1)
+        podcast = Podcast.Podcast(edited, fingerprints=True)
+        self.assertEqual(podcast.fingerprint, self.podcast.fingerprint)
+        self.assertNotEqual(podcast.items[0].fingerprint,
+                            self.podcast.items[0].fingerprint)
+        self.assertEqual(podcast.items[1].fingerprint,
+                         self.podcast.items[1].fingerprint)
+
+
+class Test_Serialization(unittest.TestCase):
+
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        basic_podcast_path = os.path.join(
+            test_dir, 'test_feeds', 'basic_podcast.rss')
+        with open(basic_podcast_path, "r") as basic_podcast_file:
+            self.basic_podcast = basic_podcast_file.read()
+        self.podcast = Podcast.Podcast(self.basic_podcast, engine='stream')
+
+    def test_to_dict(self):
+        feed_dict = self.podcast.to_dict()
+        self.assertEqual(sorted(feed_dict),
+                         sorted(Podcast.Podcast.fields + ('items',)))
+        self.assertEqual(feed_dict['itunes_complete'], "yes")
+        self.assertEqual(sorted(feed_dict['itunes_keywords']),
+                         ["Python", "Testing"])
+        self.assertEqual(feed_dict['summary'], "basic itunes summary")
+        item_dict = feed_dict['items'][0]
+        self.assertEqual(sorted(item_dict), sorted(Item.Item.fields))
+        self.assertEqual(item_dict['description'],
+                         self.podcast.items[0].description)
+        self.assertEqual(item_dict['categories'],
+                         self.podcast.items[0].categories)
+
+    def test_fields(self):
+        feed_dict = self.podcast.to_dict(
+            fields=('title', 'date_time', 'items'),
+            item_fields=('guid', 'time_published'))
+        self.assertEqual(sorted(feed_dict), ['date_time', 'items', 'title'])
+        self.assertEqual(feed_dict['items'][1], {
+            'guid': 'another basic item guid',
+            'time_published': self.podcast.items[1].time_published,
+        })
+        self.assertEqual(self.podcast.to_dict(fields=('title',)),
+                         {'title': self.podcast.title})
+        self.assertRaises(ValueError, self.podcast.to_dict, ('nope',))
+        self.assertRaises(ValueError, self.podcast.to_dict, None, ('nope',))
+
+    def test_builders_are_bounded(self):
+        fields = ('title', 'guid')
+        self.assertIs(serialize.get_builder(fields),
+                      serialize.get_builder(fields))
+        for field in Item.Item.fields:
+            for other in Item.Item.fields:
+                serialize.get_builder((field, other))
+        self.assertLessEqual(len(serialize.BUILDERS), serialize.MAX_BUILDERS)
+        self.assertEqual(self.podcast.items[0].to_dict(fields),
+                         {'title': 'basic item title',
+                          'guid': 'basic item guid'})
+
+    def test_to_json(self):
+        self.assertEqual(json.loads(self.podcast.to_json()),
+                         self.podcast.to_dict())
+
+    def test_to_json_stream(self):
+        stream = io.StringIO()
+        self.assertIsNone(self.podcast.to_json(stream))
+        self.assertEqual(stream.getvalue(), self.podcast.to_json())
+
+    def test_to_json_fields(self):
+        item_fields = ('guid', 'published_datetime')
+        result = json.loads(self.podcast.to_json(
+            fields=('items',), item_fields=item_fields))
+        self.assertEqual(list(result), ['items'])
+        self.assertEqual(result['items'][0]['published_datetime'],
+                         self.podcast.items[0].published_datetime.isoformat())
+        result = json.loads(self.podcast.to_json(fields=('title',)))
+        self.assertEqual(result, {'title': self.podcast.title})
+
+    def test_item_to_json(self):
+        item = self.podcast.items[0]
+        self.assertEqual(json.loads(item.to_json()), item.to_dict())
+        self.assertEqual(json.loads(item.to_json(fields=('date_time',))),
+                         {'date_time': item.date_time.isoformat()})
+
+
+class Test_Field_Projection(unittest.TestCase):
+
+    item_fields = ('title', 'guid', 'enclosure_url', 'enclosure_length',
+                   'published_date')
+
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        basic_podcast_path = os.path.join(
+            test_dir, 'test_feeds', 'basic_podcast.rss')
+        with open(basic_podcast_path, "r") as basic_podcast_file:
+            self.basic_podcast = basic_podcast_file.read()
+        self.expected = Podcast.Podcast(self.basic_podcast, engine='stream')
+        self.podcast = Podcast.Podcast(
+            self.basic_podcast, engine='stream',
+            fields=('title', 'owner_name', 'time_published', 'is_valid_rss'),
+            item_fields=self.item_fields)
+
+    def test_requested_fields(self):
+        for field in ('title', 'owner_name', 'time_published',
+                      'is_valid_rss'):
+            self.assertEqual(getattr(self.podcast, field),
+                             getattr(self.expected, field))
+        for item, expected in zip(self.podcast.items, self.expected.items):
+            for field in self.item_fields:
+                self.assertEqual(getattr(item, field),
+                                 getattr(expected, field))
+
+    def test_unrequested_fields(self):
+        for field in ('link', 'owner_email', 'published_date', 'date_time',
+                      'is_valid_podcast'):
+            self.assertRaises(AttributeError, getattr, self.podcast, field)
+        for field in ('enclosure_type', 'author', 'time_published'):
+            self.assertRaises(AttributeError, getattr,
+                              self.podcast.items[0], field)
+
+    def test_item_dates(self):
+        podcast = Podcast.Podcast(self.basic_podcast, fields=(),
+                                  item_fields=('date_time',))
+        self.assertEqual(podcast.items[0].date_time,
+                         self.expected.items[0].date_time)
+        self.assertRaises(AttributeError, getattr, podcast.items[0],
+                          'published_date')
+
+    def test_lazy_items(self):
+        podcast = Podcast.Podcast(self.basic_podcast, engine='stream',
+                                  lazy_items=True, fields=(),
+                                  item_fields=('guid', 'time_published'))
+        item = podcast.items[1]
+        self.assertEqual(item.time_published,
+                         self.expected.items[1].time_published)
+        self.assertEqual(item.guid, self.expected.items[1].guid)
+        self.assertRaises(AttributeError, getattr, item, 'title')
+
+    def test_only_needed_elements_are_recorded(self):
+        names = set(element.name
+                    for element in self.podcast.item_soups[0].elements)
+        self.assertEqual(names, set(['title', 'guid', 'enclosure', 'pubdate']))
+
+    def test_fingerprints(self):
+        podcast = Podcast.Podcast(self.basic_podcast, engine='stream',
+                                  fields=('title',), item_fields=('guid',),
+                                  fingerprints=True)
+        self.assertEqual(len(podcast.fingerprint), 32)
+        self.assertEqual(len(podcast.items[0].fingerprint), 32)
+
+    def test_to_dict(self):
+        feed_dict = self.podcast.to_dict()
+        self.assertEqual(sorted(feed_dict), [
+            'is_valid_rss', 'items', 'owner_name', 'time_published', 'title'])
+        self.assertEqual(sorted(feed_dict['items'][0]),
+                         sorted(self.item_fields))
+
+    def test_unknown_fields(self):
+        self.assertRaises(ValueError, Podcast.Podcast, self.basic_podcast,
+                          fields=('nope',))
+        self.assertRaises(ValueError, Podcast.Podcast, self.basic_podcast,
+                          item_fields=('nope',))
+
+    def test_is_valid_podcast_needs_enclosure_type(self):
+        item_fields = set(['title', 'guid', 'enclosure_url',
+                           'enclosure_length', 'published_date'])
+        for engine in ('soup', 'stream'):
+            podcast = Podcast.Podcast(self.basic_podcast, engine=engine,
+                                      item_fields=item_fields)
+            expected = Podcast.Podcast(self.basic_podcast, engine=engine)
+            self.assertEqual(podcast.is_valid_podcast, True)
+            self.assertEqual(podcast.title, expected.title)
+            self.assertEqual(podcast.items[0].guid, expected.items[0].guid)
+        podcast = Podcast.Podcast(self.basic_podcast, engine='stream',
+                                  fields=('is_valid_podcast',),
+                                  item_fields=('guid',))
+        self.assertEqual(podcast.is_valid_podcast, True)
+        podcast = Podcast.Podcast(self.basic_podcast, engine='stream',
+                                  fields=('title',), item_fields=('guid',))
+        self.assertRaises(AttributeError, getattr, podcast.items[0],
+                          'enclosure_type')
+
+
 if __name__ == '__main__':
     unittest.main()